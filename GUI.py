@@ -1,10 +1,18 @@
 import tkinter as tk
 from string import whitespace
-from tkinter import PhotoImage
+from collections import OrderedDict
+from PIL import Image, ImageTk
 import chess
+import queue
 import threading
+import move_channel
 
-board = chess.Board()
+board = chess.Board()  # Only touched on the Tk thread
+events = queue.Queue()  # (kind, value) tuples posted by background threads, drained on the Tk thread
+EVENT_POLL_MS = 16  # Drain interval: about one check per frame at 60 Hz
+REFLOW_DELAY_MS = 60  # Resizes are laid out once the window has stopped changing for this long
+PIECE_SCALE = 60 / 87.5  # Sprite side per square side: the 60 px pieces on the original 87.5 px squares
+SPRITE_SIZES_KEPT = 3  # Sprite sizes the atlas keeps, so resizing back and forth doesn't rescale
 
 win = tk.Tk()
 win.geometry("700x700")
@@ -15,24 +23,45 @@ canvas = tk.Canvas(win, width=700, height=700)
 canvas.pack(fill=tk.BOTH, expand=True)
 
 
-pieceImages = {
-    'white_pawn': PhotoImage(file=r"pieces-png/white-pawn.png"),
-    'white_bishop': PhotoImage(file=r"pieces-png/white-bishop.png"),
-    'white_rook': PhotoImage(file=r"pieces-png/white-rook.png"),
-    'white_king': PhotoImage(file=r"pieces-png/white-king.png"),
-    'white_queen': PhotoImage(file=r"pieces-png/white-queen.png"),
-    'white_knight': PhotoImage(file=r"pieces-png/white-knight.png"),
-    'black_pawn': PhotoImage(file=r"pieces-png/black-pawn.png"),
-    'black_bishop': PhotoImage(file=r"pieces-png/black-bishop.png"),
-    'black_rook': PhotoImage(file=r"pieces-png/black-rook.png"),
-    'black_king': PhotoImage(file=r"pieces-png/black-king.png"),
-    'black_queen': PhotoImage(file=r"pieces-png/black-queen.png"),
-    'black_knight': PhotoImage(file=r"pieces-png/black-knight.png"),
-}
+class SpriteAtlas:
+    # The 12 piece images, decoded once and scaled once per sprite size. Sizes are evicted
+    # oldest first; the current one is always the newest, so on-screen images are never dropped.
+    def __init__(self, directory='pieces-png'):
+        self.sources = {}
+        for color in ('white', 'black'):
+            for name in ('pawn', 'bishop', 'rook', 'king', 'queen', 'knight'):
+                self.sources[f'{color}_{name}'] = Image.open(f'{directory}/{color}-{name}.png').convert('RGBA')
+        self.scaled = OrderedDict()  # Sprite side in px -> {name: PhotoImage}
+
+    def sprites(self, square_size):
+        side = max(1, round(square_size * PIECE_SCALE))
+        if side in self.scaled:
+            self.scaled.move_to_end(side)
+        else:
+            self.scaled[side] = {name: ImageTk.PhotoImage(image.resize((side, side), Image.LANCZOS))
+                                 for name, image in self.sources.items()}
+            if len(self.scaled) > SPRITE_SIZES_KEPT:
+                self.scaled.popitem(last=False)
+        return self.scaled[side]
+
+
+squareSize = 87.5  # Side of one square in px; follows the window via reflow
+atlas = SpriteAtlas()
+pieceImages = atlas.sprites(squareSize)
 boardColumns = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h']
+pendingReflow = None
 
-#Create grid of squares and pieces
-def draw_board(board):
+squareItems = {}  # chess square -> (rectangle id, image id), created once by render_board
+shownPieces = {}  # chess square -> symbol of the piece drawn there now
+
+
+def piece_image(piece):
+    color = 'white' if piece.color == chess.WHITE else 'black'
+    return pieceImages[color + '_' + chess.piece_name(piece.piece_type)]
+
+
+#Create grid of squares, each with an image item for its piece, once
+def render_board():
     for row in range(8):
         for col in range(8):
 
@@ -41,104 +70,120 @@ def draw_board(board):
             else:
                 fill_color = '#411903'
 
-            canvas.create_rectangle(col*87.5, row*87.5, 87.5 + col*87.5, 87.5 + row*87.5, fill=fill_color)
-
-            squareCheck = chess.parse_square(boardColumns[col] + str(8 - row))
-            occupy = board.piece_at(squareCheck)
-
-            if str(occupy) == 'r':
-                canvas.create_image(43.75 + 87.5 * col, 43.75 + 87.5 * row, anchor=tk.CENTER,
-                                    image=pieceImages['black_rook'])
-            elif str(occupy) == 'q':
-                canvas.create_image(43.75 + 87.5 * col, 43.75 + 87.5 * row, anchor=tk.CENTER,
-                                    image=pieceImages['black_queen'])
-            elif str(occupy) == 'k':
-                canvas.create_image(43.75 + 87.5 * col, 43.75 + 87.5 * row, anchor=tk.CENTER,
-                                    image=pieceImages['black_king'])
-            elif str(occupy) == 'n':
-                canvas.create_image(43.75 + 87.5 * col, 43.75 + 87.5 * row, anchor=tk.CENTER,
-                                    image=pieceImages['black_knight'])
-            elif str(occupy) == 'p':
-                canvas.create_image(43.75 + 87.5 * col, 43.75 + 87.5 * row, anchor=tk.CENTER,
-                                    image=pieceImages['black_pawn'])
-            elif str(occupy) == 'b':
-                canvas.create_image(43.75 + 87.5 * col, 43.75 + 87.5 * row, anchor=tk.CENTER,
-                                    image=pieceImages['black_bishop'])
-            elif str(occupy) == 'R':
-                canvas.create_image(43.75 + 87.5 * col, 43.75 + 87.5 * row, anchor=tk.CENTER,
-                                    image=pieceImages['white_rook'])
-            elif str(occupy) == 'Q':
-                canvas.create_image(43.75 + 87.5 * col, 43.75 + 87.5 * row, anchor=tk.CENTER,
-                                    image=pieceImages['white_queen'])
-            elif str(occupy) == 'K':
-                canvas.create_image(43.75 + 87.5 * col, 43.75 + 87.5 * row, anchor=tk.CENTER,
-                                    image=pieceImages['white_king'])
-            elif str(occupy) == 'N':
-                canvas.create_image(43.75 + 87.5 * col, 43.75 + 87.5 * row, anchor=tk.CENTER,
-                                    image=pieceImages['white_knight'])
-            elif str(occupy) == 'P':
-                canvas.create_image(43.75 + 87.5 * col, 43.75 + 87.5 * row, anchor=tk.CENTER,
-                                    image=pieceImages['white_pawn'])
-            elif str(occupy) == 'B':
-                canvas.create_image(43.75 + 87.5 * col, 43.75 + 87.5 * row, anchor=tk.CENTER,
-                                    image=pieceImages['white_bishop'])
+            rectangle = canvas.create_rectangle(col*squareSize, row*squareSize, squareSize + col*squareSize,
+                                                squareSize + row*squareSize, fill=fill_color)
+            image = canvas.create_image(squareSize/2 + squareSize * col, squareSize/2 + squareSize * row,
+                                        anchor=tk.CENTER, state=tk.HIDDEN)
+            squareItems[chess.parse_square(boardColumns[col] + str(8 - row))] = (rectangle, image)
 
 
+#Update only the squares whose piece differs from what is drawn, so the canvas keeps the same
+#128 items all game; castling, en passant and promotion are just more changed squares
+def draw_board(board):
+    pieces = board.piece_map()
+    changed = 0
+    for square, (_, image) in squareItems.items():
+        piece = pieces.get(square)
+        symbol = piece.symbol() if piece else None
+        if shownPieces.get(square) != symbol:
+            if piece:
+                canvas.itemconfigure(image, image=piece_image(piece), state=tk.NORMAL)
+            else:
+                canvas.itemconfigure(image, state=tk.HIDDEN)
+            shownPieces[square] = symbol
+            changed += 1
+    return changed
+
+
+#Fit the board to the canvas: one pass moving the 128 items and swapping in sprites of the new size
+def reflow():
+    global squareSize, pieceImages, pendingReflow
+    pendingReflow = None
+    size = min(canvas.winfo_width(), canvas.winfo_height()) / 8
+    if size < 1 or size == squareSize:
+        return
+    squareSize = size
+    pieceImages = atlas.sprites(size)
+    for square, (rectangle, image) in squareItems.items():
+        col, row = chess.square_file(square), 7 - chess.square_rank(square)
+        canvas.coords(rectangle, col*size, row*size, size + col*size, size + row*size)
+        canvas.coords(image, size/2 + size * col, size/2 + size * row)
+    shownPieces.clear()  # Every piece gets the new sprite
+    draw_board(board)
+
+
+def on_configure(event):
+    # <Configure> fires continuously while the window is dragged; reflow once, after it settles
+    global pendingReflow
+    if pendingReflow is not None:
+        win.after_cancel(pendingReflow)
+    pendingReflow = win.after(REFLOW_DELAY_MS, reflow)
+
+
+render_board()
 draw_board(board)
 determinedMove = ''
 
-def waitCompMove():
+def drain_events():
+    # Runs on the Tk thread, the only consumer of events, so board and canvas need no locks
+    win.after(EVENT_POLL_MS, drain_events)  # Scheduled first, so a bad event can't stop the loop
     while True:
-        with open('save_move.txt', 'r') as file:
-            file.readline()  # Skip first line
-            computerMove = file.readline().strip()  # Use strip() to remove any leading/trailing whitespace
-
-            if computerMove != '':
-                return computerMove
+        try:
+            kind, value = events.get_nowait()
+        except queue.Empty:
+            break
+        if kind == 'computer_move':
+            board.push_uci(value)
+            draw_board(board)
+        elif kind == 'game_over':
+            print('\n', "Game over")
+
+
+def listen_for_computer_moves():
+    # Blocks in recv() until the backend replies, so waiting costs no CPU; it only posts to
+    # events and never touches Tk or the board itself
+    while True:
+        try:
+            cm = channel.recv()
+        except EOFError:
+            cm = None
+        if cm is None:
+            events.put(('game_over', None))
+            return
+        events.put(('computer_move', cm))
 
 
 def on_click(event):
     global determinedMove
 
+    if board.turn == chess.BLACK:
+        return  # Still waiting for the computer's reply
+
     columns = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h']
     x, y = event.x, event.y
 
-    col = int(x // 87.5)
-    row = 8 - int(y // 87.5)
+    col = int(x // squareSize)
+    row = 8 - int(y // squareSize)
+    if not (0 <= col < 8 and 1 <= row <= 8):
+        return  # Outside the board, in the margin of a non-square window
 
     determinedMove += (columns[col] + str(row))
 
     if len(determinedMove) == 4:
         try:
             board.push_uci(determinedMove)
-
-            with open("save_move.txt", "a") as file:
-                file.write(determinedMove + "\n")
+            channel.send(determinedMove)
             determinedMove = ''
-
-            # Use threading.Event to synchronize threads
-            update_event = threading.Event()
-
-            def update_after_move():
-                draw_board(board)
-                update_event.set()  # Signal that the update is complete
-
-            def check_computer_move():
-                update_event.wait()  # Wait until the board update is complete
-                cm = waitCompMove()
-                if cm:
-                    board.push_uci(cm)
-                    win.after(0, lambda: draw_board(board))
-                    with open('save_move.txt', 'r+') as file:
-                        file.truncate(0)
-
-            # Run update and computer move checking in separate threads
-            threading.Thread(target=update_after_move).start()
-            threading.Thread(target=check_computer_move).start()
+            draw_board(board)
 
         except ValueError:
             print('\n', "Invalid move")
             determinedMove = ''
 
-canvas.bind("<Button-1>", on_click)
-win.mainloop()
\ No newline at end of file
+if __name__ == '__main__':
+    channel = move_channel.connect()  # To gameProcessing.py, which must be started with --gui
+    canvas.bind("<Button-1>", on_click)
+    canvas.bind("<Configure>", on_configure)
+    threading.Thread(target=listen_for_computer_moves, daemon=True).start()
+    drain_events()
+    win.mainloop()
\ No newline at end of file
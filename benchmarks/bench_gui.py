@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# Canvas item count and redraw time of GUI.draw_board over one game, against the old version
+# that drew 64 new squares and every piece after each move. Needs a display (the GUI window
+# opens while it runs).
+# Usage: python benchmarks/bench_gui.py [--moves 200] [--seed 1]
+import argparse
+import os
+import random
+import sys
+import time
+import tkinter as tk
+import chess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+os.chdir(ROOT)  # GUI loads pieces-png/ relative to the repo root
+
+import GUI
+from GUI import canvas, win, boardColumns, piece_image
+
+
+def draw_board_legacy(board):
+    # draw_board as it was: new items on every call, the old ones left underneath
+    for row in range(8):
+        for col in range(8):
+            fill_color = '#61390b' if (row + col) % 2 == 0 else '#411903'
+            canvas.create_rectangle(col*87.5, row*87.5, 87.5 + col*87.5, 87.5 + row*87.5, fill=fill_color)
+            piece = board.piece_at(chess.parse_square(boardColumns[col] + str(8 - row)))
+            if piece:
+                canvas.create_image(43.75 + 87.5 * col, 43.75 + 87.5 * row, anchor=tk.CENTER, image=piece_image(piece))
+
+
+def random_game(moves, seed):
+    # Random legal moves, starting over when a game ends, so there are always `moves` positions
+    rng = random.Random(seed)
+    board = chess.Board()
+    positions = []
+    while len(positions) < moves:
+        if board.is_game_over():
+            board.reset()
+        board.push(rng.choice(list(board.legal_moves)))
+        positions.append(board.copy(stack=False))
+    return positions
+
+
+def run(draw, positions):
+    # Per-move time of the draw plus Tk repainting the canvas
+    times = []
+    for board in positions:
+        start = time.perf_counter()
+        draw(board)
+        win.update()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def report(name, times):
+    # The last moves show whether redraws slow down as the game goes on
+    ordered = sorted(times)
+    print(f"{name:>12}: {len(canvas.find_all()):6d} canvas items at the end, redraw "
+          f"mean {sum(times) / len(times) * 1000:6.2f} ms, p99 {ordered[int(len(times) * 0.99)] * 1000:6.2f} ms, "
+          f"last 20 moves {sum(times[-20:]) / 20 * 1000:6.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--moves', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    positions = random_game(args.moves, args.seed)
+    win.update()
+
+    report('incremental', run(GUI.draw_board, positions))
+
+    canvas.delete('all')
+    report('old', run(draw_board_legacy, positions))
+    win.destroy()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# Per-frame time of occupancy.classify_squares against the old loop over 64 squares, and a check
+# that both give the same grid. Runs on recorded warped boards (the warped_scan*.jpg files
+# detect_grid writes) or, without --frames, on synthetic ones.
+# Usage: python benchmarks/bench_occupancy.py [--frames 'warped_scan*.jpg'] [--repeat 20]
+import argparse
+import glob
+import os
+import sys
+import time
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from occupancy import classify_squares
+
+
+def classify_squares_loop(warped):
+    # detect_grid's square loop as it was, without the per-square print
+    h, w = warped.shape
+    grid = np.zeros((8, 8), dtype=bool)
+    kernel = np.ones((2, 2), np.uint8)
+    for row in range(8):
+        for col in range(8):
+            square = warped[row * (h // 8):(row + 1) * (h // 8), col * (w // 8):(col + 1) * (w // 8)]
+            thresh = cv2.adaptiveThreshold(square, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 15, 3)
+            thresh = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
+            thresh = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, kernel)
+            dark_ratio = np.sum(thresh == 0) / thresh.size
+            grid[row, col] = (dark_ratio > 0.55) and (np.mean(square) < 90) and (np.var(square) > 200)
+    return grid
+
+
+def synthetic_boards(count, size=512, seed=0):
+    # Dim checkerboards with mottled dark pieces (dark, with bright specks) on about half the
+    # squares, plus sensor noise
+    rng = np.random.default_rng(seed)
+    step = size // 8
+    for _ in range(count):
+        board = np.zeros((size, size), np.uint8)
+        for row in range(8):
+            for col in range(8):
+                square = board[row * step:(row + 1) * step, col * step:(col + 1) * step]
+                if rng.random() < 0.5:
+                    square[:] = np.where(rng.random((step, step)) < 0.2, 150, rng.integers(10, 30))
+                else:
+                    square[:] = 70 if (row + col) % 2 else 110
+        noise = rng.normal(0, 4, board.shape)
+        yield np.clip(board + noise, 0, 255).astype(np.uint8)
+
+
+def time_per_frame(classify, frames, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for frame in frames:
+            classify(frame)
+    return (time.perf_counter() - start) / (repeat * len(frames)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--frames', help="Glob of recorded warped boards, e.g. 'warped_scan*.jpg'")
+    parser.add_argument('--count', type=int, default=20, help="Synthetic boards when no --frames")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    if args.frames:
+        frames = [cv2.imread(path, cv2.IMREAD_GRAYSCALE) for path in sorted(glob.glob(args.frames))]
+        frames = [frame for frame in frames if frame is not None]
+        if not frames:
+            sys.exit(f"No images match {args.frames}")
+    else:
+        frames = list(synthetic_boards(args.count))
+
+    same = sum(np.array_equal(classify_squares(frame), classify_squares_loop(frame)) for frame in frames)
+    print(f"{len(frames)} frames, identical grids on {same}")
+
+    old = time_per_frame(classify_squares_loop, frames, args.repeat)
+    new = time_per_frame(classify_squares, frames, args.repeat)
+    print(f"  loop: {old:6.2f} ms/frame")
+    print(f"vector: {new:6.2f} ms/frame  ({old / new:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,6 @@
+import threading
 import time
+import uuid
 import chess
 import requests
 import sys
@@ -10,12 +12,17 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from motion import MotionController
 from ux import UXHandler
 from vision_mediapip import VisionMediaPipeDetector
+from server_link import ServerLink
+from fallback import LocalFallback
+from pipeline import ChangeDetector, LatencyTrace, Stage, SETTLE_TIME
 from shared.utils import load_json
 
 # Use path relative to project root
 config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'shared', 'config.json')
 SERVER_URL = load_json(config_path)['server_url']
+SETTLE_TIME = load_json(config_path).get('settle_time_s', SETTLE_TIME)  # Stillness before the board is read
 BOARD = chess.Board()
+SERVER_DEADLINE = 6.0  # Seconds for the whole server call, retries included, before playing locally instead
 
 class ChessBotClient:
     def __init__(self):
@@ -26,102 +33,167 @@ class ChessBotClient:
         self.retry_count = 0
         self.max_retries = 3
         self.scan_count = 0  # New: Counter for scans to log every N scans if too verbose
+        self.game_id = uuid.uuid4().hex  # Lets the server keep this game's engine warm
+        self.new_game = True
+        self.server = ServerLink(SERVER_URL)  # Keep-alive session reused for every move
+        self.fallback = LocalFallback()  # Plays on-device while the server is down or slow
+        self.offline = False
+        # Stages: the main thread only captures frames; reading the board and the server call,
+        # and the arm each run on their own thread (UXHandler queues speech on its own), so none
+        # waits on another
+        self.decision = Stage('decision')
+        self.arm = Stage('arm')
+        self.arm_busy = threading.Event()  # Set while the arm moves, so its motion isn't read as a move
         
     def send_to_server(self, move_uci):
-        payload = {'move': move_uci, 'fen': BOARD.fen()}
+        payload = {'move': move_uci, 'fen': BOARD.fen(), 'game_id': self.game_id, 'new_game': self.new_game}
         try:
-            response = requests.post(f'{SERVER_URL}/validate_and_predict', json=payload, timeout=5)
+            response = self.server.post('/validate_and_predict', payload, deadline=SERVER_DEADLINE)
+            latency = self.server.latency['/validate_and_predict']
+            print(f"DEBUG: Server round trip p50 <={latency.percentile(50)} ms, "
+                  f"p99 <={latency.percentile(99)} ms over {latency.total} moves")
             if response.status_code == 200:
                 data = response.json()
+                if self.offline:
+                    print("DEBUG: Server back — game resynced from our FEN")
+                    self.offline = False
+                self.new_game = False
                 return data
             else:
                 print(f"Server error: {response.status_code}")
-                return {'valid': False, 'error': 'Server unavailable', 'explanation': 'Check connection'}
         except requests.exceptions.RequestException as e:
             print(f"Network error: {e}")
-            return {'valid': False, 'error': 'Network issue', 'explanation': 'Retrying...'}
+        return self.play_locally(move_uci)
+
+    def play_locally(self, move_uci):
+        # The board stays authoritative: the next request that reaches the server carries our FEN
+        # with new_game set, so its session restarts from here instead of its stale position
+        if not self.offline:
+            print("DEBUG: Server unavailable — playing on-device until it returns")
+            self.offline = True
+        self.new_game = True
+        return self.fallback.play_turn(BOARD, move_uci)
     
-    def handle_move(self, move_uci):
+    def handle_move(self, move_uci, trace=None):
+        # Runs on the decision stage; speech and the arm are handed their work without waiting,
+        # so "Playing e7 to e5" is said while the arm is already on its way
+        trace = trace or LatencyTrace()
         data = self.send_to_server(move_uci)
+        trace.mark('server replied')
         if data['valid']:
             self.ux.feedback_move_valid(move_uci)
             BOARD.push(chess.Move.from_uci(move_uci))
             ai_move = data['ai_move']
             if ai_move:
                 self.ux.feedback_ai_move(ai_move)
-                from_sq, to_sq = ai_move[:2], ai_move[2:]
-                success = self.motion.execute_move(from_sq, to_sq)
-                if success:
-                    BOARD.push(chess.Move.from_uci(ai_move))
-                else:
-                    self.ux.speak("Motion failed — retrying next turn.")
+                self.arm_busy.set()
+                self.arm.submit(self.play_ai_move, ai_move, trace)
+            else:
+                print(f"DEBUG: Latency {trace.report()}")
             if data['game_over']:
-                winner = 'White' if BOARD.result() == '0-1' else 'Black'
-                self.ux.game_over(winner)
+                final = BOARD.copy()
+                if ai_move:
+                    final.push(chess.Move.from_uci(ai_move))
+                result = final.result()
+                self.ux.game_over({'1-0': 'White', '0-1': 'Black'}.get(result))  # None: a draw
                 self.game_active = False
         else:
+            print(f"DEBUG: Latency {trace.report()}")
             self.ux.feedback_invalid(data['explanation'])
             self.retry_count += 1
             if self.retry_count >= self.max_retries:
-                self.ux.speak("Too many errors — resetting game.")
+                self.ux.speak("Too many errors — resetting game.", wait=True)  # Said before the arm homes
                 self.reset_game()
                 self.retry_count = 0
+
+    def play_ai_move(self, ai_move, trace):
+        # Runs on the arm stage, while the move is still being announced
+        trace.mark('arm starts moving')
+        print(f"DEBUG: Latency {trace.report()}")
+        from_sq, to_sq = ai_move[:2], ai_move[2:]
+        try:
+            success = self.motion.execute_move(from_sq, to_sq)
+            if success:
+                BOARD.push(chess.Move.from_uci(ai_move))
+            else:
+                self.ux.speak("Motion failed — retrying next turn.")
+        finally:
+            self.arm_busy.clear()
     
     def reset_game(self):
         global BOARD
         BOARD = chess.Board()
+        self.game_id = uuid.uuid4().hex
+        self.new_game = True
         self.motion.home_position()
         self.ux.speak("Game reset — your turn.")
     
     def run_loop(self):
+        # Event-driven: every frame goes through the change detector, and the board is read once
+        # it has been still for SETTLE_TIME after motion (a hand placing a piece, or the arm)
         self.ux.speak("Game started — watching for your move.")
         self.motion.home_position()
+        self.vision.sync_every = None  # Resynced after every arm move instead
+        detector = ChangeDetector(SETTLE_TIME)
+        detector.last_motion = time.perf_counter()  # Wait for a still board before the first reference
+        resync = True
         
         while self.game_active:
-            self.scan_count += 1
-            print(f"\n=== SCAN #{self.scan_count} START ===")
-            print("Current software board positions:")
-            print(BOARD)  # ASCII board with positions
-            print(f"Software FEN: {BOARD.fen()}")
-            
-            # New: Enhanced vision debugging - always log raw result
-            result = self.vision.infer_move()
-            print(f"Raw vision result: {result}")  # Full tuple or None
-            
-            if result is None:
-                print("DEBUG: No move detected (low confidence) — scanning...")
-                time.sleep(2)
+            frame = self.vision.capture_frame()
+            now = time.perf_counter()
+            if self.arm_busy.is_set():
+                detector.reset()
+                detector.last_motion = now  # Once the arm stops, settle before taking a new reference
+                resync = True
                 continue
-            
-            move_uci, gesture, expression, conf = result
-            conf_float = float(conf) if conf is not None else 0.0
-            print(f"Parsed vision: move_uci='{move_uci}' (type: {type(move_uci)}), "
-                  f"gesture='{gesture}', expression='{expression}', conf={conf_float} (raw: {conf}, type: {type(conf)})")
-            
-            # New: Log potential moves even below threshold for debugging
-            if move_uci:
-                print(f"DEBUG: Potential move {move_uci} at conf {conf_float:.2f} "
-                      f"(threshold 0.8) — {'ACCEPTED' if conf_float >= 0.8 else 'REJECTED'}")
-            else:
-                print("DEBUG: No move_uci in result — ignoring.")
-            
-            if move_uci and conf_float >= 0.8:
-                print(f"DEBUG: Processing detected move {move_uci} (conf {conf_float:.2f}, gesture {gesture}, expr {expression})")
-                self.handle_move(move_uci)
-                if gesture == 'wave':
-                    self.motion.home_position()  # Pause for wave response
-                    self.ux.speak("Wave received — hello!")
-                if expression == 'frown':
-                    self.ux.speak("Tough move? Keep going — you're improving!")
-            else:
-                print("DEBUG: Skipping — low conf or no move.")
-            
-            print("=== SCAN END ===\n")
-            time.sleep(2)  # Scan interval
+            released = detector.feed(frame, now)
+            if released is None:
+                continue
+            if resync:
+                self.decision.submit(self.vision.sync, frame)
+                resync = False
+                continue
+            trace = LatencyTrace()
+            trace.mark('piece released', released)
+            trace.mark('board settled', now)
+            self.decision.submit(self.on_board_settled, frame, trace)
         
+        for stage in (self.decision, self.arm):
+            stage.close()
+        self.ux.close()  # Finish the last announcements
         self.vision.close()
+        self.server.close()
         self.motion.home_position()
 
+    def on_board_settled(self, frame, trace):
+        self.scan_count += 1
+        print(f"\n=== SCAN #{self.scan_count} START ===")
+        result = self.vision.infer_move(frame)
+        trace.mark('move read')
+        print(f"Raw vision result: {result}")  # Full tuple or None
+        if result is None:
+            print("DEBUG: No move detected (low confidence) — waiting for the next change...")
+            return
+        
+        move_uci, gesture, expression, conf = result
+        conf_float = float(conf) if conf is not None else 0.0
+        print(f"Parsed vision: move_uci='{move_uci}', gesture='{gesture}', expression='{expression}', conf={conf_float}")
+        
+        if move_uci and conf_float >= 0.8:
+            print(f"DEBUG: Processing detected move {move_uci} (conf {conf_float:.2f}, gesture {gesture}, expr {expression})")
+            self.handle_move(move_uci, trace)
+            if gesture == 'wave':
+                self.arm.submit(self.motion.home_position)  # Pause for wave response
+                self.ux.speak("Wave received — hello!")
+            if expression == 'frown':
+                self.ux.speak("Tough move? Keep going — you're improving!")
+            print("Current software board positions:")
+            print(BOARD)  # ASCII board after the human's move (the AI reply lands when the arm is done)
+            print(f"Software FEN: {BOARD.fen()}")
+        else:
+            print("DEBUG: Skipping — low conf or no move.")
+        print("=== SCAN END ===\n")
+
 if __name__ == '__main__':
     bot = ChessBotClient()
     bot.run_loop()
\ No newline at end of file
@@ -0,0 +1,47 @@
+import os
+import sys
+import time
+import chess
+
+# Server modules import each other flat, so put server/ on the path for its validation and engine
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'server'))
+
+from minimax import MinimaxEngine
+from validation import validate_move
+
+# On-device stand-in for the server when it is down or too slow: validates the human's move
+# with the server's own rules and answers with the in-process minimax engine under a time cap.
+# Replies have the same shape as /validate_and_predict so the client handles both alike.
+LOCAL_THINK_TIME = 2.0  # Seconds per AI move on the Pi
+
+
+class LocalFallback:
+    def __init__(self, think_time=LOCAL_THINK_TIME):
+        self.think_time = think_time
+        self.engine = MinimaxEngine()  # Transposition table kept across offline moves
+        self.moves_played = 0
+
+    def play_turn(self, board, move_uci):
+        valid, new_fen, explanation = validate_move(move_uci, board.fen())
+        if not valid:
+            return {'valid': False, 'ai_move': None, 'fen': board.fen(), 'game_over': board.is_game_over(),
+                    'explanation': explanation, 'search': None}
+        ai_board = chess.Board(new_fen)
+        start = time.perf_counter()
+        result = self.engine.search(ai_board, time_limit=self.think_time)
+        ai_uci = result.move.uci() if result.move else None
+        if ai_uci:
+            ai_board.push(result.move)
+            explanation += f" AI counters with {ai_uci}: thinking on my own while the server is away."
+        else:
+            explanation += " AI passed — your advantage!"
+        self.moves_played += 1
+        return {
+            'valid': True,
+            'ai_move': ai_uci,
+            'fen': new_fen,
+            'game_over': ai_board.is_game_over(),
+            'explanation': explanation,
+            'search': {'source': 'local', 'depth': result.depth, 'nodes': result.nodes,
+                       'time_ms': round((time.perf_counter() - start) * 1000)},
+        }
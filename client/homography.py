@@ -0,0 +1,66 @@
+import cv2
+import numpy as np
+
+# The board's perspective matrix, found once with a detector's full line search and reused for
+# as long as the board's corners stay where they were. Checking that is a template match of a
+# small patch around each corner, so a normal frame costs one warpPerspective.
+PATCH = 48  # Side (px) of the patch kept around each board corner
+SEARCH = 16  # How far (px) each corner is looked for around its last position
+DRIFT_PX = 3.0  # A corner found further away than this has moved
+MIN_MATCH = 0.6  # Normalised correlation below this: the corner is hidden (a hand, the arm), not moved
+MIN_DRIFTED = 2  # Corners that must have moved before the board is searched for again
+LOST_CORNERS = 3  # Corners unmatched at once: more than a piece covers, so the board has moved
+
+
+def _patch(gray, x, y, half):
+    x, y = int(round(x)), int(round(y))
+    if x - half < 0 or y - half < 0 or x + half > gray.shape[1] or y + half > gray.shape[0]:
+        return None
+    return gray[y - half:y + half, x - half:x + half]
+
+
+class BoardHomography:
+    def __init__(self, size):
+        self.size = size  # Side of the warped, top-down board image
+        self.matrix = None
+        self.corners = None
+        self.templates = []
+
+    def matrix_for(self, gray, find_corners):
+        # Cached matrix, or a new one from find_corners() (4 points: top-left, top-right,
+        # bottom-right, bottom-left, or None) on the first frame and after drift
+        if self.matrix is not None and not self.drifted(gray):
+            return self.matrix
+        corners = find_corners()
+        if corners is None:
+            self.matrix = None  # Search again on the next frame
+            return None
+        self.corners = np.float32(corners)
+        dst_points = np.float32([[0, 0], [self.size, 0], [self.size, self.size], [0, self.size]])
+        self.matrix = cv2.getPerspectiveTransform(self.corners, dst_points)
+        self.templates = [None if p is None else p.copy()
+                          for p in (_patch(gray, x, y, PATCH // 2) for x, y in self.corners)]
+        print("DEBUG VISION: Board located — homography cached")
+        return self.matrix
+
+    def drifted(self, gray):
+        # A shift larger than SEARCH leaves the corners unmatched rather than moved. The board is
+        # only read once it has settled, with no hand in view, so LOST_CORNERS unmatched counts too
+        moved = unmatched = 0
+        for (x, y), template in zip(self.corners, self.templates):
+            window = _patch(gray, x, y, PATCH // 2 + SEARCH)
+            if template is None or window is None:
+                continue  # Corner too close to the frame edge to track
+            scores = cv2.matchTemplate(window, template, cv2.TM_CCOEFF_NORMED)
+            _, best, _, (best_x, best_y) = cv2.minMaxLoc(scores)
+            if best < MIN_MATCH:
+                unmatched += 1
+            elif np.hypot(best_x - SEARCH, best_y - SEARCH) > DRIFT_PX:
+                moved += 1
+        if moved >= MIN_DRIFTED:
+            print(f"DEBUG VISION: Board drifted ({moved} corners moved) — locating it again")
+            return True
+        if unmatched >= LOST_CORNERS:
+            print(f"DEBUG VISION: Board corners lost ({unmatched} unmatched) — locating it again")
+            return True
+        return False
@@ -0,0 +1,53 @@
+import cv2
+import numpy as np
+
+# Which squares of a warped (top-down, grayscale) board image hold a piece. All 64 squares are
+# measured in one pass over the image instead of a Python loop over squares.
+BLOCK_SIZE = 15  # adaptiveThreshold neighbourhood (px)
+THRESH_C = 3
+DARK_RATIO_MIN = 0.55  # Share of a square's pixels that threshold dark
+MEAN_MAX = 90
+VAR_MIN = 200  # Pieces have texture, empty squares are flat; tuned for the plastic set
+KERNEL = np.ones((2, 2), np.uint8)  # Anchored at (1, 1): each pixel combines itself with the pixels above and left
+
+
+def _morph(padded, op, neutral, pad):
+    # cv2.dilate or cv2.erode over the whole padded board, with the row above and the column left
+    # of every square set to the op's neutral value first, so the first row and column of a
+    # square only see the square itself, as with cv2's default border on a single square
+    padded[:, pad - 1] = neutral
+    padded[:, :, :, pad - 1] = neutral
+    flat = padded.reshape(padded.shape[0] * padded.shape[1], -1)
+    return op(flat, KERNEL).reshape(padded.shape)
+
+
+def square_stats(warped):
+    # Dark ratio, mean and variance of every square, each an (8, 8) array. Squares are the
+    # (rows, h, cols, w) blocks of the image, processed exactly as if each were its own image:
+    # the blocks are edge-padded so one adaptiveThreshold over the whole board never mixes
+    # neighbouring squares, and the close/open never reach across a square's edge
+    h, w = warped.shape[0] // 8, warped.shape[1] // 8
+    squares = warped[:8 * h, :8 * w].reshape(8, h, 8, w)
+    pad = BLOCK_SIZE // 2
+    padded = np.pad(squares, ((0, 0), (pad, pad), (0, 0), (pad, pad)), mode='edge')
+    thresh = cv2.adaptiveThreshold(padded.reshape(8 * (h + 2 * pad), -1), 255,
+                                   cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, BLOCK_SIZE, THRESH_C)
+    thresh = thresh.reshape(padded.shape)
+    thresh = _morph(_morph(thresh, cv2.dilate, 0, pad), cv2.erode, 255, pad)  # Close
+    thresh = _morph(_morph(thresh, cv2.erode, 255, pad), cv2.dilate, 0, pad)  # Open: remove noise
+    dark = (thresh[:, pad:pad + h, :, pad:pad + w] == 0).sum(axis=3).sum(axis=1)
+
+    # Mean and variance from exact integer sums; summing the contiguous axis first keeps it fast
+    n = h * w
+    total = squares.sum(axis=3, dtype=np.int64).sum(axis=1)
+    values = squares.astype(np.int32)
+    total_sq = (values * values).sum(axis=3, dtype=np.int64).sum(axis=1)
+    return dark / n, total / n, (n * total_sq - total * total) / (n * n)
+
+
+def classify_squares(warped):
+    # (8, 8) bool grid, row 0 at the top of the image
+    if warped.shape[0] < 8 or warped.shape[1] < 8:
+        return np.zeros((8, 8), dtype=bool)
+    dark_ratio, mean, var = square_stats(warped)
+    return (dark_ratio > DARK_RATIO_MIN) & (mean < MEAN_MAX) & (var > VAR_MIN)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# Disk cache of synthesised speech, one WAV per distinct text, so a phrase is run through espeak
+# once ever instead of on every announcement. Only meant for the bounded set of fixed and move
+# phrases; one-off text would grow it without limit. Warm it ahead of a game with:
+#   python client/phrase_cache.py            (fixed phrases)
+#   python client/phrase_cache.py --moves    (plus the move phrases for every square pair)
+import argparse
+import hashlib
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+import chess
+
+CACHE_DIR = os.path.expanduser(os.environ.get('TTS_CACHE_DIR', '~/.cache/robotic-turk/tts'))
+ESPEAK_ARGS = ('espeak',)  # Part of the key: changing voice or speed re-synthesises everything
+MOVE_PHRASE = re.compile(r'Playing [a-h][1-8] to [a-h][1-8]\.|Your move [a-h][1-8][a-h][1-8][nbrq]? is valid — my turn\.')
+
+
+def ai_move_phrase(from_sq, to_sq):
+    # Must match UXHandler.feedback_ai_move word for word to hit the cache
+    return f"Playing {from_sq} to {to_sq}."
+
+
+def human_move_phrase(move_uci):
+    # Must match UXHandler.feedback_move_valid word for word to hit the cache
+    return f"Your move {move_uci} is valid — my turn."
+
+
+def is_move_phrase(text):
+    return MOVE_PHRASE.fullmatch(text) is not None
+
+
+def move_phrases():
+    for from_square in chess.SQUARES:
+        for to_square in chess.SQUARES:
+            if from_square != to_square:
+                from_sq, to_sq = chess.square_name(from_square), chess.square_name(to_square)
+                yield ai_move_phrase(from_sq, to_sq)
+                yield human_move_phrase(from_sq + to_sq)
+
+
+class PhraseCache:
+    def __init__(self, directory=CACHE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, text):
+        key = hashlib.sha1('\0'.join(ESPEAK_ARGS + (text,)).encode()).hexdigest()
+        return os.path.join(self.directory, f'{key}.wav')
+
+    def get(self, text):
+        # Path of the cached WAV, synthesising it first on a miss
+        path = self.path(text)
+        if not os.path.exists(path):
+            self._synthesize(text, path)
+        return path
+
+    def _synthesize(self, text, path):
+        # Written to a temporary file and renamed, so a half-written WAV is never played
+        fd, tmp = tempfile.mkstemp(suffix='.wav', dir=self.directory)
+        os.close(fd)
+        try:
+            subprocess.run(list(ESPEAK_ARGS) + ['-w', tmp, text], check=True, capture_output=True)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def warm(self, texts, workers=None):
+        # Synthesise every missing text; returns how many were added
+        missing = [text for text in dict.fromkeys(texts) if not os.path.exists(self.path(text))]
+        with ThreadPoolExecutor(workers or os.cpu_count()) as pool:
+            list(pool.map(self.get, missing))
+        return len(missing)
+
+
+def main():
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from ux import FIXED_PHRASES
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--moves', action='store_true', help="Also both move phrases for every square pair (8064 phrases)")
+    parser.add_argument('--dir', default=CACHE_DIR)
+    args = parser.parse_args()
+    texts = list(FIXED_PHRASES) + (list(move_phrases()) if args.moves else [])
+    cache = PhraseCache(args.dir)
+    added = cache.warm(texts)
+    print(f"{added} phrases synthesised, {len(texts) - added} already cached in {args.dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+import queue
+import threading
+import time
+import cv2
+
+# Building blocks of the event-driven client loop: frames go through a cheap change detector
+# at full camera rate, and the heavy work (vision, server, speech, arm) runs on stage threads.
+SETTLE_TIME = 0.6  # Seconds the board must stay still after motion before it is read
+MOTION_THRESHOLD = 6.0  # Mean absolute difference (0-255) between consecutive thumbnails
+THUMB_SIZE = (80, 60)  # Frames are compared at this size: enough to see a hand, cheap at 30 fps
+
+
+class ChangeDetector:
+    def __init__(self, settle_time=SETTLE_TIME, threshold=MOTION_THRESHOLD):
+        self.settle_time = settle_time
+        self.threshold = threshold
+        self.reset()
+
+    def reset(self):
+        self.previous = None
+        self.last_motion = None
+
+    def feed(self, frame, now):
+        # Returns the time motion last ended once the scene has been still for settle_time, else None
+        thumb = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), THUMB_SIZE, interpolation=cv2.INTER_AREA)
+        moving = self.previous is not None and cv2.absdiff(thumb, self.previous).mean() > self.threshold
+        self.previous = thumb
+        if moving:
+            self.last_motion = now
+            return None
+        if self.last_motion is not None and now - self.last_motion >= self.settle_time:
+            released, self.last_motion = self.last_motion, None
+            return released
+        return None
+
+
+class LatencyTrace:
+    # Timestamps of one move through the pipeline, reported relative to the first
+    def __init__(self):
+        self.marks = []
+
+    def mark(self, name, at=None):
+        self.marks.append((name, time.perf_counter() if at is None else at))
+
+    def report(self):
+        start = self.marks[0][1]
+        return " -> ".join(f"{name} +{(at - start) * 1000:.0f} ms" for name, at in self.marks)
+
+
+class Stage:
+    # Worker thread running submitted calls in order, so a slow stage never holds up the others
+    def __init__(self, name):
+        self.name = name
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, function, *args):
+        self._queue.put((function, args))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            function, args = item
+            try:
+                function(*args)
+            except Exception as e:
+                print(f"DEBUG: {self.name} stage failed: {e!r}")
+
+    def close(self):
+        # Finishes what is queued, then stops
+        self._queue.put(None)
+        self._thread.join()
@@ -0,0 +1,162 @@
+import bisect
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+# Keep-alive HTTP link to the chess server: one pooled session, so only the first move pays
+# TCP setup over Wi-Fi; retries with backoff for requests that never reached the server; a
+# circuit breaker so a dead server costs nothing per scan; and latency histograms per endpoint.
+CONNECT_TIMEOUT = 2.0  # Seconds
+READ_TIMEOUT = 8.0  # The server caps a search at 5 s (MAX_MOVETIME_MS); this covers that plus the trip
+MAX_ATTEMPTS = 3
+BACKOFF_BASE = 0.2  # Seconds; doubles each retry, capped at BACKOFF_MAX, full jitter
+BACKOFF_MAX = 2.0
+RETRY_STATUSES = (502, 503, 504)  # Proxy/overload answers where the move was not processed
+BREAKER_THRESHOLD = 3  # Consecutive failed calls that open the circuit
+BREAKER_RESET = 10.0  # Seconds open before one trial call is let through
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    pass
+
+
+def normalize_url(url):
+    # config.json has carried a bare host:port; requests needs a scheme
+    url = url.strip().rstrip('/')
+    return url if '://' in url else f'http://{url}'
+
+
+class LatencyHistogram:
+    def __init__(self, buckets_ms=LATENCY_BUCKETS_MS):
+        self.buckets_ms = buckets_ms
+        self.counts = [0] * (len(buckets_ms) + 1)  # Last bucket: slower than the largest bound
+        self.total = 0
+        self.total_ms = 0.0
+
+    def record(self, seconds):
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(self.buckets_ms, ms)] += 1
+        self.total += 1
+        self.total_ms += ms
+
+    def percentile(self, p):
+        # Upper bound of the bucket holding the p-th percentile (None past the last bound)
+        if not self.total:
+            return None
+        rank = p / 100 * self.total
+        seen = 0
+        for bound, count in zip(self.buckets_ms + (None,), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+    def summary(self):
+        buckets = {f'<={bound}ms': count for bound, count in zip(self.buckets_ms, self.counts)}
+        buckets[f'>{self.buckets_ms[-1]}ms'] = self.counts[-1]
+        return {
+            'count': self.total,
+            'mean_ms': round(self.total_ms / self.total, 1) if self.total else None,
+            'p50_ms': self.percentile(50),
+            'p99_ms': self.percentile(99),
+            'buckets': buckets,
+        }
+
+
+class CircuitBreaker:
+    def __init__(self, threshold=BREAKER_THRESHOLD, reset_after=BREAKER_RESET):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        return 'half-open' if time.monotonic() - self.opened_at >= self.reset_after else 'open'
+
+    def allow(self):
+        # Half-open lets one trial through and re-arms the timer until that trial reports back
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.reset_after:
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def record(self, ok):
+        with self._lock:
+            if ok:
+                self.failures = 0
+                self.opened_at = None
+            else:
+                self.failures += 1
+                if self.failures >= self.threshold:
+                    self.opened_at = time.monotonic()
+
+
+class ServerLink:
+    def __init__(self, base_url, max_attempts=MAX_ATTEMPTS):
+        self.base_url = normalize_url(base_url)
+        self.max_attempts = max_attempts
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0)  # Retries are ours
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.breaker = CircuitBreaker()
+        self.latency = {}  # Endpoint path -> LatencyHistogram of successful calls
+        self.retries = 0
+
+    def post(self, path, payload, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), deadline=None):
+        # Returns the Response; raises requests exceptions (CircuitOpenError while the server is down).
+        # Only failures where the server cannot have handled the move are retried: connection
+        # errors and RETRY_STATUSES. A read timeout means it may still be searching, so no retry.
+        # deadline (seconds) bounds the whole call, retries and backoff included: each attempt's
+        # timeouts are cut to what is left, and Timeout is raised once nothing is.
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"{self.base_url} unreachable — not retrying for now")
+        expires = time.monotonic() + deadline if deadline else None
+        for attempt in range(self.max_attempts):
+            attempt_timeout = timeout
+            if expires is not None:
+                left = expires - time.monotonic()
+                if left <= 0:
+                    self.breaker.record(False)
+                    raise requests.exceptions.Timeout(f"{self.base_url} gave no answer within {deadline} s")
+                attempt_timeout = (min(timeout[0], left), min(timeout[1], left))
+            start = time.perf_counter()
+            try:
+                response = self.session.post(f'{self.base_url}{path}', json=payload, timeout=attempt_timeout)
+            except requests.exceptions.ConnectionError:
+                if attempt + 1 == self.max_attempts:
+                    self.breaker.record(False)
+                    raise
+            except requests.exceptions.RequestException:
+                self.breaker.record(False)
+                raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt + 1 == self.max_attempts:
+                    self.breaker.record(response.status_code < 500)
+                    self.latency.setdefault(path, LatencyHistogram()).record(time.perf_counter() - start)
+                    return response
+            self.retries += 1
+            backoff = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+            if expires is not None:
+                backoff = min(backoff, max(expires - time.monotonic(), 0))
+            time.sleep(backoff)
+
+    def stats(self):
+        return {
+            'breaker': self.breaker.state,
+            'retries': self.retries,
+            'latency': {path: histogram.summary() for path, histogram in self.latency.items()},
+        }
+
+    def close(self):
+        self.session.close()
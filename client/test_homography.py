@@ -0,0 +1,85 @@
+import os
+import sys
+import cv2
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from homography import BoardHomography
+
+READS = 10  # Settled board reads; the client takes about one per move
+
+ORIGIN = (160, 80)  # Top-left corner of the board in the frame
+SQUARE = 40
+
+
+def scene(dx=0, dy=0, piece_on_corner=False):
+    # Textured table with an 8x8 board and its border, shifted by (dx, dy)
+    rng = np.random.default_rng(0)
+    gray = cv2.GaussianBlur(rng.integers(60, 200, (480, 640)).astype(np.uint8), (0, 0), 3)
+    x0, y0 = ORIGIN[0] + dx, ORIGIN[1] + dy
+    for row in range(8):
+        for col in range(8):
+            shade = 230 if (row + col) % 2 == 0 else 40
+            x, y = x0 + col * SQUARE, y0 + row * SQUARE
+            cv2.rectangle(gray, (x, y), (x + SQUARE - 1, y + SQUARE - 1), shade, -1)
+    cv2.rectangle(gray, (x0 - 4, y0 - 4), (x0 + 8 * SQUARE + 3, y0 + 8 * SQUARE + 3), 0, 2)
+    if piece_on_corner:
+        cv2.circle(gray, (x0 + SQUARE // 2, y0 + SQUARE // 2), 16, 120, -1)
+    return gray
+
+
+def corners(dx=0, dy=0):
+    x0, y0 = ORIGIN[0] + dx, ORIGIN[1] + dy
+    side = 8 * SQUARE
+    return [(x0, y0), (x0 + side, y0), (x0 + side, y0 + side), (x0, y0 + side)]
+
+
+class Finder:
+    # Stands in for a detector's full board search, counting how often it is run
+    def __init__(self, found):
+        self.found = found
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.found
+
+
+def test_unmoved_board_reuses_the_matrix():
+    homography, finder = BoardHomography(640), Finder(corners())
+    for _ in range(READS):
+        homography.matrix_for(scene(), finder)
+    assert finder.calls == 1
+
+
+def test_small_shift_is_found_again_at_once():
+    homography = BoardHomography(640)
+    homography.matrix_for(scene(), Finder(corners()))
+    finder = Finder(corners(6, 0))
+    homography.matrix_for(scene(6, 0), finder)
+    assert finder.calls == 1
+
+
+@pytest.mark.parametrize('dx, dy', [(25, 0), (60, 30)])  # Past SEARCH: no corner matches any more
+def test_large_shift_is_found_again_on_the_next_read(dx, dy):
+    homography = BoardHomography(640)
+    homography.matrix_for(scene(), Finder(corners()))
+    finder = Finder(corners(dx, dy))
+    matrix = homography.matrix_for(scene(dx, dy), finder)
+    assert finder.calls == 1
+    top_left = cv2.perspectiveTransform(np.float32([[corners(dx, dy)[0]]]), matrix)
+    assert np.allclose(top_left, 0, atol=1e-3)
+    for _ in range(READS):
+        homography.matrix_for(scene(dx, dy), finder)
+    assert finder.calls == 1  # Tracked again from the new position
+
+
+def test_piece_on_a_corner_square_is_not_a_lost_board():
+    homography = BoardHomography(640)
+    homography.matrix_for(scene(), Finder(corners()))
+    finder = Finder(corners())
+    for _ in range(READS):
+        homography.matrix_for(scene(piece_on_corner=True), finder)
+    assert finder.calls == 0
@@ -0,0 +1,23 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from phrase_cache import ai_move_phrase, human_move_phrase, is_move_phrase, move_phrases
+
+
+def test_every_warmed_move_phrase_is_cacheable():
+    phrases = list(move_phrases())
+    assert len(phrases) == 8064
+    assert all(map(is_move_phrase, phrases))
+
+
+def test_spoken_move_phrases_are_cacheable():
+    assert is_move_phrase(ai_move_phrase('e7', 'e5'))
+    assert is_move_phrase(human_move_phrase('e2e4'))
+    assert is_move_phrase(human_move_phrase('a7a8q'))
+
+
+def test_other_text_is_not_cached():
+    assert not is_move_phrase("Invalid move: A knight can't move from g1 to g3.. Try again.")
+    assert not is_move_phrase(human_move_phrase('e2e9'))
@@ -0,0 +1,101 @@
+import os
+import sys
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import server_link
+from server_link import CircuitBreaker, CircuitOpenError, LatencyHistogram, ServerLink, normalize_url
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(server_link.time, 'monotonic', clock)
+    return clock
+
+
+def test_breaker_opens_after_threshold_failures(clock):
+    breaker = CircuitBreaker(threshold=3, reset_after=10)
+    for _ in range(2):
+        breaker.record(False)
+    assert breaker.state == 'closed' and breaker.allow()
+    breaker.record(False)
+    assert breaker.state == 'open'
+    assert not breaker.allow()
+
+
+def test_breaker_half_open_lets_one_trial_through(clock):
+    breaker = CircuitBreaker(threshold=1, reset_after=10)
+    breaker.record(False)
+    clock.now += 10
+    assert breaker.state == 'half-open'
+    assert breaker.allow()
+    assert not breaker.allow()  # Timer re-armed until the trial reports back
+
+
+def test_breaker_closes_on_success_and_reopens_on_failed_trial(clock):
+    breaker = CircuitBreaker(threshold=1, reset_after=10)
+    breaker.record(False)
+    clock.now += 10
+    assert breaker.allow()
+    breaker.record(False)
+    assert breaker.state == 'open'
+    clock.now += 10
+    assert breaker.allow()
+    breaker.record(True)
+    assert breaker.state == 'closed' and breaker.failures == 0
+
+
+def test_open_breaker_fails_fast_without_a_request(clock):
+    link = ServerLink('127.0.0.1:9')
+    link.breaker.record(False)
+    link.breaker.record(False)
+    link.breaker.record(False)
+    with pytest.raises(CircuitOpenError):
+        link.post('/validate_and_predict', {})
+    link.close()
+
+
+def test_latency_percentiles():
+    histogram = LatencyHistogram(buckets_ms=(10, 100))
+    for seconds in (0.005, 0.005, 0.05, 0.5):
+        histogram.record(seconds)
+    assert histogram.percentile(50) == 10
+    assert histogram.percentile(75) == 100
+    assert histogram.percentile(100) is None  # Slower than the largest bound
+    assert histogram.summary()['buckets'] == {'<=10ms': 2, '<=100ms': 1, '>100ms': 1}
+
+
+def test_normalize_url():
+    assert normalize_url(' 192.168.1.184:8000/ ') == 'http://192.168.1.184:8000'
+    assert normalize_url('https://host') == 'https://host'
+
+
+def test_deadline_bounds_retries_and_backoff(clock, monkeypatch):
+    link = ServerLink('127.0.0.1:9', max_attempts=5)
+    timeouts = []
+
+    def refuse(url, json, timeout):
+        timeouts.append(timeout)
+        clock.now += timeout[0]  # Each connect attempt runs its full timeout
+        raise server_link.requests.exceptions.ConnectionError()
+
+    monkeypatch.setattr(link.session, 'post', refuse)
+    monkeypatch.setattr(server_link.time, 'sleep', lambda seconds: setattr(clock, 'now', clock.now + seconds))
+    start = clock.now
+    with pytest.raises(server_link.requests.exceptions.Timeout):
+        link.post('/validate_and_predict', {}, deadline=5.0)
+    assert clock.now - start <= 5.0
+    assert timeouts[0] == (2.0, 5.0)
+    assert all(connect <= 2.0 for connect, _ in timeouts) and timeouts[-1][0] < 2.0
+    assert link.breaker.failures == 1
+    link.close()
@@ -1,27 +1,134 @@
+import queue
 import subprocess
+import threading
 import time
+import wave
+from phrase_cache import PhraseCache, ai_move_phrase, human_move_phrase, is_move_phrase
 
-class UXHandler:
+# Phrases the client says as-is; cached on disk (warmed in the background at startup) so
+# saying them is just playback. Along with the move phrases they are the only text cached:
+# anything else (an invalid-move explanation) is spoken straight through espeak.
+FIXED_PHRASES = (
+    "Game started — watching for your move.",
+    "Motion failed — retrying next turn.",
+    "Too many errors — resetting game.",
+    "Game reset — your turn.",
+    "Wave received — hello!",
+    "Tough move? Keep going — you're improving!",
+    "Game over. White wins! Good game.",
+    "Game over. Black wins! Good game.",
+    "Game over. It's a draw! Good game.",
+)
+
+class WarmPlayer:
+    # One aplay process kept open and fed raw PCM, so an announcement starts without launching
+    # a player. Restarted only if a WAV comes in another format (espeak's never change).
     def __init__(self):
+        self._process = None
+        self._format = None
+
+    def play(self, path):
+        with wave.open(path, 'rb') as wav:
+            audio_format = (wav.getframerate(), wav.getnchannels(), wav.getsampwidth())
+            frames = wav.readframes(wav.getnframes())
+        if self._process is None or self._process.poll() is not None or audio_format != self._format:
+            self._start(audio_format)
+        self._process.stdin.write(frames)
+        self._process.stdin.flush()
+        # The pipe takes the audio at once; wait it out so the queue stays in step with the speaker
+        rate, channels, width = audio_format
+        time.sleep(len(frames) / (rate * channels * width))
+
+    def _start(self, audio_format):
+        self.close()
+        rate, channels, width = audio_format
+        sample = {1: 'U8', 2: 'S16_LE'}[width]
+        self._process = subprocess.Popen(['aplay', '-q', '-t', 'raw', '-f', sample, '-r', str(rate),
+                                          '-c', str(channels), '-'], stdin=subprocess.PIPE)
+        self._format = audio_format
+
+    def close(self):
+        if self._process is not None:
+            self._process.stdin.close()
+            self._process.wait()
+            self._process = None
+
+
+class UXHandler:
+    def __init__(self, phrases=FIXED_PHRASES):
         self.current_status = 'idle'
-        
-    def speak(self, text):
-        subprocess.run(['espeak', text])
-    
+        self._queue = queue.Queue()  # Utterances in order; speak() only enqueues
+        self._cache = PhraseCache()
+        self._fixed = frozenset(phrases)
+        self._player = WarmPlayer()
+        threading.Thread(target=self._run, name='speech', daemon=True).start()
+        threading.Thread(target=self._prepare, args=(phrases,), name='speech-cache', daemon=True).start()
+
+    def speak(self, text, wait=False):
+        # Returns at once (so the arm can move while we talk) unless wait is set
+        done = threading.Event()
+        self._queue.put((text, done))
+        if wait:
+            done.wait()
+
+    def _prepare(self, phrases):
+        try:
+            self._cache.warm(phrases, workers=1)  # One espeak at a time; the game is starting
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"DEBUG UX: Could not pre-synthesise phrases: {e}")
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            text, done = item
+            try:
+                if self._cacheable(text):
+                    self._player.play(self._cache.get(text))  # Synthesised once, then cached
+                else:
+                    self._say_directly(text)
+            except (OSError, EOFError, wave.Error, subprocess.CalledProcessError) as e:
+                print(f"DEBUG UX: Cached speech failed ({e}) — speaking directly")
+                self._say_directly(text)
+            finally:
+                done.set()
+                self._queue.task_done()
+
+    def _cacheable(self, text):
+        return text in self._fixed or is_move_phrase(text)
+
+    def _say_directly(self, text):
+        try:
+            subprocess.run(['espeak', text])
+        except OSError as e:
+            print(f"DEBUG UX: Speech failed: {e}")
+
+    def close(self):
+        # Says whatever is still queued, then stops the speech thread
+        self._queue.put(None)
+        self._queue.join()
+        self._player.close()
+
     def feedback_move_valid(self, move):
-        self.speak(f"Your move {move} is valid — my turn.")
+        self.speak(human_move_phrase(move))
         self.current_status = 'waiting'
-    
+
     def feedback_invalid(self, explanation):
         self.speak(f"Invalid move: {explanation}. Try again.")
         self.current_status = 'scanning'
         time.sleep(2)
-    
+
     def feedback_ai_move(self, ai_move):
         from_sq, to_sq = ai_move[:2], ai_move[2:]
-        self.speak(f"Playing {from_sq} to {to_sq}.")
+        self.speak(ai_move_phrase(from_sq, to_sq))
         self.current_status = 'executing'
-    
+
     def game_over(self, winner):
-        self.speak(f"Game over. {winner} wins! Good game.")
-        self.current_status = 'idle'
\ No newline at end of file
+        # winner is 'White', 'Black', or None for a draw
+        if winner is None:
+            self.speak("Game over. It's a draw! Good game.")
+        else:
+            self.speak(f"Game over. {winner} wins! Good game.")
+        self.current_status = 'idle'
@@ -8,6 +8,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from shared.utils import fen_to_grid, grid_to_fen
+from homography import BoardHomography
 
 class VisionDetector:
     def __init__(self):
@@ -16,6 +17,7 @@ class VisionDetector:
         self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
         self.previous_fen = chess.Board().fen()
         self.square_size = 80  # Pixels per square (tune for your camera)
+        self.homography = BoardHomography(640)  # Board warp, reused until the board moves
 
     def capture_frame(self):
         ret, frame = self.cap.read()
@@ -25,6 +27,27 @@ class VisionDetector:
 
     def detect_grid(self, frame):
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        # The line search runs only until the board is found, and again if it drifts
+        matrix = self.homography.matrix_for(gray, lambda: self.find_board_corners(gray))
+        if matrix is not None:
+            warped = cv2.warpPerspective(gray, matrix, (640, 640))
+        else:
+            warped = gray  # Fallback to original if lines not detected
+        
+        # Divide warped frame into 8x8 grid
+        h, w = warped.shape
+        grid = np.zeros((8, 8), dtype=bool)
+        for row in range(8):
+            for col in range(8):
+                y = row * (h // 8)
+                x = col * (w // 8)
+                square = warped[y:y+(h//8), x:x+(w//8)]
+                # Occupancy: mean brightness < 128 = piece present
+                occupancy = np.mean(square) < 128
+                grid[row, col] = occupancy
+        return grid
+
+    def find_board_corners(self, gray):
         # Edge detection for squares
         edges = cv2.Canny(gray, 50, 150)
         
@@ -48,26 +71,8 @@ class VisionDetector:
             bottom_h = max(h[3] for h in horiz_lines)
             left_v = min(v[0] for v in vert_lines)
             right_v = max(v[2] for v in vert_lines)
-            src_points = np.float32([[left_v, top_h], [right_v, top_h], [right_v, bottom_h], [left_v, bottom_h]])
-            # Target perfect square grid (8x8 ratio)
-            dst_points = np.float32([[0, 0], [640, 0], [640, 640], [0, 640]])
-            matrix = cv2.getPerspectiveTransform(src_points, dst_points)
-            warped = cv2.warpPerspective(gray, matrix, (640, 640))
-        else:
-            warped = gray  # Fallback to original if lines not detected
-        
-        # Divide warped frame into 8x8 grid
-        h, w = warped.shape
-        grid = np.zeros((8, 8), dtype=bool)
-        for row in range(8):
-            for col in range(8):
-                y = row * (h // 8)
-                x = col * (w // 8)
-                square = warped[y:y+(h//8), x:x+(w//8)]
-                # Occupancy: mean brightness < 128 = piece present
-                occupancy = np.mean(square) < 128
-                grid[row, col] = occupancy
-        return grid
+            return [[left_v, top_h], [right_v, top_h], [right_v, bottom_h], [left_v, bottom_h]]
+        return None
 
     def infer_move(self):
         frame = self.capture_frame()
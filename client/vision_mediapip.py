@@ -9,6 +9,8 @@ from picamera2 import Picamera2  # Pi Camera backend
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from shared.utils import fen_to_grid, grid_to_fen
+from occupancy import classify_squares
+from homography import BoardHomography
 
 class VisionMediaPipeDetector:
     def __init__(self):
@@ -20,6 +22,8 @@ class VisionMediaPipeDetector:
         self.square_size = 80  # Pixels per square
         self.scan_count = 0  # For debug logging
         self.baseline_scans = 5  # First 5 scans sync without move
+        self.sync_every = 3  # Scans between forced resyncs when polling; None when the caller resyncs
+        self.homography = BoardHomography(512)  # Board warp, reused until the board moves
 
     def capture_frame(self):
         frame = self.picam2.capture_array()
@@ -29,10 +33,52 @@ class VisionMediaPipeDetector:
         print("DEBUG VISION: Capturing frame shape:", frame.shape)
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         
-        # Deblur & Enhance: Bilateral filter + CLAHE for low-light contrast
+        # Deblur & Enhance: Bilateral filter + CLAHE for low-light contrast (the occupancy
+        # thresholds are tuned on this image, so it is still made every frame)
         deblurred = cv2.bilateralFilter(gray, 9, 75, 75)  # Preserves edges, reduces blur
         clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
         enhanced = clahe.apply(deblurred)
+        
+        # The line search runs only until the board is found, and again if it drifts
+        matrix = self.homography.matrix_for(gray, lambda: self.find_board_corners(enhanced))
+        if matrix is None:
+            # Fallback: a rough quad, never cached, so the line search is retried next frame
+            src_points = self.contour_corners(enhanced)
+            if src_points is not None:
+                dst_points = np.float32([[0, 0], [512, 0], [512, 512], [0, 512]])
+                matrix = cv2.getPerspectiveTransform(src_points, dst_points)
+        if matrix is not None:
+            warped = cv2.warpPerspective(enhanced, matrix, (512, 512))  # Use enhanced
+        else:
+            print("DEBUG VISION: Raw fallback on enhanced")
+            h, w = enhanced.shape
+            size = min(h, w)
+            start_y, start_x = (h - size) // 2, (w - size) // 2
+            warped = enhanced[start_y:start_y + size, start_x:start_x + size]
+            print(f"DEBUG VISION: Centered crop to {warped.shape}")
+        
+        # Dynamic square_size
+        h, w = warped.shape
+        square_size = min(h // 8, w // 8)
+        self.square_size = square_size
+        grid = classify_squares(warped)  # All 64 squares in one vectorized pass
+        
+        # Quick validation: Flip if upside-down (check occupied rows)
+        occupied_rows = np.sum(grid, axis=1)
+        if occupied_rows[0] > occupied_rows[7]:  # Black on top?
+            grid = np.flipud(grid)
+            print("DEBUG VISION: Auto-flipped grid for white-at-bottom")
+        
+        print("DEBUG VISION: Full grid:\n", grid)
+        occupied_count = np.sum(grid)
+        print(f"DEBUG VISION: Total occupied: {occupied_count}/64")
+        
+        # Save warped for debug (optional, comment if not needed)
+        cv2.imwrite(f'warped_scan{self.scan_count}.jpg', warped)
+        return grid
+
+    def find_board_corners(self, enhanced):
+        # Board corners (top-left, top-right, bottom-right, bottom-left) from the grid lines, or None
         blurred = cv2.GaussianBlur(enhanced, (5, 5), 0)  # Still blur for edges
         
         # Edges: Canny on enhanced + Sobel vert
@@ -60,7 +106,6 @@ class VisionMediaPipeDetector:
         
         print(f"DEBUG VISION: Horiz lines: {len(horiz_lines)}, Vert lines: {len(vert_lines)}")
         
-        warped = None
         if len(horiz_lines) >= 4 and len(vert_lines) >= 4:
             # Improved clustering: Aim for 9 lines, with wider gap tol for blur
             def cluster_lines(lines, is_horiz=True, num_target=9):
@@ -91,87 +136,38 @@ class VisionMediaPipeDetector:
                 left_v, right_v = v_clusters[0], v_clusters[-1]
                 h_board = bottom_h - top_h
                 w_board = right_v - left_v
-                if 100 < h_board < frame.shape[0]-100 and 100 < w_board < frame.shape[1]-100:  # Bounds check
-                    src_points = np.float32([[left_v, top_h], [right_v, top_h], [right_v, bottom_h], [left_v, bottom_h]])
-                    dst_points = np.float32([[0, 0], [512, 0], [512, 512], [0, 512]])  # Fixed square
-                    matrix = cv2.getPerspectiveTransform(src_points, dst_points)
-                    warped = cv2.warpPerspective(enhanced, matrix, (512, 512))  # Use enhanced
-                    print(f"DEBUG VISION: Clustered warp to {warped.shape}")
-        
+                if 100 < h_board < enhanced.shape[0]-100 and 100 < w_board < enhanced.shape[1]-100:  # Bounds check
+                    print("DEBUG VISION: Board corners from clustered lines")
+                    return [[left_v, top_h], [right_v, top_h], [right_v, bottom_h], [left_v, bottom_h]]
+        return None
+
+    def contour_corners(self, enhanced):
         # Fallback: Enhanced contour
-        if warped is None:
-            print("DEBUG VISION: Fallback to contour on enhanced")
-            contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            if contours:
-                largest = max(contours, key=cv2.contourArea)
-                epsilon = 0.06 * cv2.arcLength(largest, True)  # Even looser for blur
-                approx = cv2.approxPolyDP(largest, epsilon, True)
-                if len(approx) >= 4:  # Accept near-quad
-                    src_points = approx.reshape(-1, 2).astype(np.float32)[:4]  # Take first 4
-                    dst_points = np.float32([[0, 0], [512, 0], [512, 512], [0, 512]])
-                    matrix = cv2.getPerspectiveTransform(src_points, dst_points)
-                    warped = cv2.warpPerspective(enhanced, matrix, (512, 512))
-                    print("DEBUG VISION: Contour warp successful")
-        
-        if warped is None:
-            print("DEBUG VISION: Raw fallback on enhanced")
-            h, w = enhanced.shape
-            size = min(h, w)
-            start_y, start_x = (h - size) // 2, (w - size) // 2
-            warped = enhanced[start_y:start_y + size, start_x:start_x + size]
-            print(f"DEBUG VISION: Centered crop to {warped.shape}")
-        
-        # Dynamic square_size
-        h, w = warped.shape
-        square_size = min(h // 8, w // 8)
-        self.square_size = square_size
-        grid = np.zeros((8, 8), dtype=bool)
-        
-        for row in range(8):
-            for col in range(8):
-                y_start = row * (h // 8)
-                y_end = (row + 1) * (h // 8)
-                x_start = col * (w // 8)
-                x_end = (col + 1) * (w // 8)
-                square = warped[y_start:y_end, x_start:x_end]
-                
-                if square.size > 0:
-                    # Adaptive thresh + stronger morph for blur
-                    thresh = cv2.adaptiveThreshold(square, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 15, 3)
-                    kernel = np.ones((2,2), np.uint8)  # Smaller for fine details
-                    thresh = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
-                    thresh = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, kernel)  # Remove noise
-                    dark_ratio = np.sum(thresh == 0) / thresh.size
-                    mean_val = np.mean(square)
-                    
-                    # Further relaxed + variance check (pieces have texture variance > empties)
-                    var_val = np.var(square)
-                    occupancy = (dark_ratio > 0.55) and (mean_val < 90) and (var_val > 200)  # Tune var for plastic texture
-                else:
-                    dark_ratio, mean_val, var_val = 0.5, 128, 0
-                    occupancy = False
-                
-                grid[row, col] = occupancy
-                print(f"DEBUG VISION: Square r{row}c{col}: mean={mean_val:.1f}, dark={dark_ratio:.2f}, var={var_val:.0f}, occ={occupancy}")
-        
-        # Quick validation: Flip if upside-down (check occupied rows)
-        occupied_rows = np.sum(grid, axis=1)
-        if occupied_rows[0] > occupied_rows[7]:  # Black on top?
-            grid = np.flipud(grid)
-            print("DEBUG VISION: Auto-flipped grid for white-at-bottom")
-        
-        print("DEBUG VISION: Full grid:\n", grid)
-        occupied_count = np.sum(grid)
-        print(f"DEBUG VISION: Total occupied: {occupied_count}/64")
-        
-        # Save warped for debug (optional, comment if not needed)
-        cv2.imwrite(f'warped_scan{self.scan_count}.jpg', warped)
-        return grid
+        print("DEBUG VISION: Fallback to contour on enhanced")
+        edges = cv2.Canny(cv2.GaussianBlur(enhanced, (5, 5), 0), 50, 150)
+        contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        if contours:
+            largest = max(contours, key=cv2.contourArea)
+            epsilon = 0.06 * cv2.arcLength(largest, True)  # Even looser for blur
+            approx = cv2.approxPolyDP(largest, epsilon, True)
+            if len(approx) >= 4:  # Accept near-quad
+                print("DEBUG VISION: Contour warp successful")
+                return approx.reshape(-1, 2).astype(np.float32)[:4]  # Take first 4
+        return None
+
+    def sync(self, frame):
+        # Take this frame as the reference board (e.g. after the arm moved), no move inferred
+        grid = self.detect_grid(frame)
+        self.previous_grid = grid.copy()
+        self.previous_fen = grid_to_fen(grid)
+        self.scan_count = max(self.scan_count, self.baseline_scans)
 
-    def infer_move(self):
+    def infer_move(self, frame=None):
+        # Uses the given frame (already captured by the caller) or captures one
         self.scan_count += 1
         print(f"\n=== VISION SCAN #{self.scan_count} ===")
-        frame = self.capture_frame()
+        if frame is None:
+            frame = self.capture_frame()
         if frame is None:
             print("DEBUG VISION: No frame captured")
             return (None, None, None, 0.0)
@@ -228,7 +224,7 @@ class VisionMediaPipeDetector:
         print(f"DEBUG VISION: Final move_uci='{move_uci}', conf={move_conf:.2f}")
         
         # Periodic full sync
-        if self.scan_count % 3 == 0 or num_changes > 4:
+        if (self.sync_every and self.scan_count % self.sync_every == 0) or num_changes > 4:
             print("DEBUG VISION: Periodic sync — updating previous")
             self.previous_grid = current_grid.copy()
             self.previous_fen = grid_to_fen(current_grid)
@@ -0,0 +1,2 @@
+# test_servos.py scripts drive the real arm when run; they are not pytest tests
+collect_ignore = ['test_servos.py', 'client/test_servos.py']
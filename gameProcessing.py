@@ -1,62 +1,120 @@
 import chess
 import numpy as np  # Already installed
+import sys
+import os
 from art import tprint  # Already installed
 # Other imports...
 
-print("DEBUG: Starting gameProcessing.py")
-
-# Main board setup
-board = chess.Board()
-print("DEBUG: Board created")
-
-tprint("CHESS")  # Your ASCII art
-print("DEBUG: ASCII art printed")
-
-# Game loop (this is where it's likely stuck)
-while not board.is_game_over():
-    print("DEBUG: Top of game loop")
-    
-    # User move input
-    print("DEBUG: Waiting for user move...")
-    user_move = input("Your move (e.g., e2 e4): ").strip()
-    print(f"DEBUG: User entered: '{user_move}'")
-    
-    if user_move:
-        try:
-            # Parse move
-            move = board.parse_san(user_move)  # Or board.parse_uci(user_move)
-            print(f"DEBUG: Parsed move: {move}")
-            board.push(move)
-            print("DEBUG: User move applied")
-        except Exception as e:
-            print(f"DEBUG: Move parse error: {e}")
-            continue
-    else:
-        print("DEBUG: Empty input, skipping")
-    
-    # AI move
-    print("DEBUG: Calculating AI move...")
-    best_move = your_ai_function(board)  # Replace with your minimax call
-    print(f"DEBUG: AI chose: {best_move}")
-    
-    board.push(best_move)
-    print("DEBUG: AI move applied")
-    
-    # Arm move (your integration)
-    print("DEBUG: Calling arm move...")
-    from_square = best_move.uci()[:2]
-    to_square = best_move.uci()[2:]
-    home_position()
-    move_to_square(from_square)
-    pick_up_piece()
-    move_to_square(to_square)
-    release_piece()
-    home_position()
-    print("DEBUG: Arm move complete")
-    
-    # Print board
-    print("DEBUG: Printing board...")
-    print(board)  # Or your ASCII print
-    print("DEBUG: Bottom of loop")
-
-print("DEBUG: Game over")
\ No newline at end of file
+# Server modules import each other flat, so put server/ on the path for the in-process engine
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server'))
+
+from minimax import MinimaxEngine
+import move_channel
+
+AI_THINK_TIME = 3.0  # Seconds per AI move
+
+
+def load_arm():
+    # servo_control drives the servos over I2C as soon as it is imported; without the board
+    # (or adafruit_servokit) the game still runs, the AI's moves just aren't played on it
+    try:
+        import servo_control
+    except (ImportError, OSError, RuntimeError, ValueError) as e:
+        print(f"DEBUG: No arm ({e}) — moves are shown only")
+        return None
+    return servo_control
+
+
+def play(board, engine, gui=None, arm=None, think_time=AI_THINK_TIME):
+    # Game loop: the human's move (from the GUI when gui is a move_channel connection, else the
+    # terminal), then the AI's reply, played on the arm if there is one
+    while not board.is_game_over():
+        print("DEBUG: Top of game loop")
+        
+        # User move input
+        print("DEBUG: Waiting for user move...")
+        if gui:
+            try:
+                user_move = gui.recv()  # Blocks without using the CPU until the GUI sends a move
+            except EOFError:
+                print("DEBUG: GUI closed")
+                return
+        else:
+            user_move = input("Your move (e.g., e2 e4): ").strip()
+        print(f"DEBUG: User entered: '{user_move}'")
+        
+        if user_move:
+            try:
+                # Parse move
+                move = board.parse_san(user_move)  # Or board.parse_uci(user_move)
+                print(f"DEBUG: Parsed move: {move}")
+                board.push(move)
+                print("DEBUG: User move applied")
+            except Exception as e:
+                print(f"DEBUG: Move parse error: {e}")
+                continue
+        else:
+            print("DEBUG: Empty input, skipping")
+        if board.is_game_over():
+            break  # The human's move ended it; there is no AI move to search for
+        
+        # AI move
+        print("DEBUG: Calculating AI move...")
+        best_move = engine.search(board, time_limit=think_time).move  # Minimax w/ alpha-beta (server/minimax.py)
+        print(f"DEBUG: AI chose: {best_move}")
+        
+        board.push(best_move)
+        print("DEBUG: AI move applied")
+        if gui:
+            gui.send(best_move.uci())  # The GUI shows it while the arm is still moving
+        
+        # Arm move (your integration)
+        if arm:
+            print("DEBUG: Calling arm move...")
+            from_square = best_move.uci()[:2]
+            to_square = best_move.uci()[2:]
+            arm.home_position()
+            arm.move_to_square(from_square)
+            arm.pick_up_piece()
+            arm.move_to_square(to_square)
+            arm.release_piece()
+            arm.home_position()
+            print("DEBUG: Arm move complete")
+        
+        # Print board
+        print("DEBUG: Printing board...")
+        print(board)  # Or your ASCII print
+        print("DEBUG: Bottom of loop")
+
+    print(f"DEBUG: Game over ({board.result()})")
+    if gui:
+        gui.send(None)
+
+
+def main():
+    use_gui = '--gui' in sys.argv  # Moves come from GUI.py over move_channel instead of the terminal
+    print("DEBUG: Starting gameProcessing.py")
+
+    # Main board setup
+    board = chess.Board()
+    print("DEBUG: Board created")
+
+    tprint("CHESS")  # Your ASCII art
+    print("DEBUG: ASCII art printed")
+
+    arm = load_arm()
+    gui = None
+    if use_gui:
+        print("DEBUG: Waiting for the GUI to connect...")
+        gui = move_channel.serve()
+        print("DEBUG: GUI connected")
+
+    try:
+        play(board, MinimaxEngine(), gui, arm)  # The engine keeps its transposition table across the game
+    finally:
+        if gui:
+            gui.close()
+
+
+if __name__ == '__main__':
+    main()
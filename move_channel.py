@@ -0,0 +1,28 @@
+import os
+import time
+from multiprocessing.connection import Listener, Client
+
+# Link between GUI.py and gameProcessing.py: one local socket carrying moves as framed messages
+# (multiprocessing.connection), so each side blocks in recv() instead of polling a file.
+# Moves are UCI strings, in order; None means the game is over.
+ADDRESS = ('localhost', int(os.environ.get('MOVE_CHANNEL_PORT', 6001)))
+AUTHKEY = b'acr-moves'
+CONNECT_TIMEOUT = 30  # Seconds the GUI waits for the backend to start listening
+
+
+def serve():
+    # Backend side: returns the connection once the GUI has connected
+    with Listener(ADDRESS, authkey=AUTHKEY) as listener:
+        return listener.accept()
+
+
+def connect(timeout=CONNECT_TIMEOUT):
+    # GUI side: retries until the backend is listening
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return Client(ADDRESS, authkey=AUTHKEY)
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
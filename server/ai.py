@@ -1,14 +1,259 @@
-from stockfish import Stockfish
-
-STOCKFISH_PATH = '/opt/homebrew/bin/stockfish'  # Update path
-
-def predict_move(fen):
-    stockfish = Stockfish(path=STOCKFISH_PATH, parameters={
-        "Threads": 4,
-        "Hash": 256,
-        "Skill Level": 10
-    })
-    stockfish.set_position(fen)
-    best_move = stockfish.get_best_move()
+import dataclasses
+import os
+import threading
+import time
+import chess
+import chess.engine
+from book import OpeningBook
+from engine_pool import EnginePool, ENGINE_FAILURES
+from minimax import MinimaxEngine, TranspositionTable, MATE_SCORE, MAX_PLY
+from move_cache import MoveCache
+from parallel_search import ParallelSearch
+from sessions import SessionManager
+from validation import parse_board
+
+AI_ENGINE = os.environ.get('AI_ENGINE', 'stockfish')  # 'stockfish' (UCI engine pool) or 'minimax' (in-process)
+STOCKFISH_PATH = os.environ.get('STOCKFISH_PATH', '/opt/homebrew/bin/stockfish')  # Update path
+ENGINE_POOL_SIZE = int(os.environ.get('ENGINE_POOL_SIZE', '2'))
+ENGINE_OPTIONS = {
+    "Threads": 4,
+    "Hash": 256,
+    "Skill Level": 10
+}
+SEARCH_DEPTH = 15  # Default when a request sets no limit (same depth the stockfish wrapper used)
+MAX_MOVETIME_MS = int(os.environ.get('MAX_MOVETIME_MS', '5000'))  # Server-wide cap on any search
+MOVE_OVERHEAD_MS = 50  # Kept back from the budget for UCI round trip and response
+PONDER = os.environ.get('PONDER', '1') == '1'  # Keep searching the expected reply while the human thinks
+REPLY_GRACE = 0.25  # Seconds past the budget before a silent engine is treated as hung (worst-case overrun)
+MAX_SESSIONS = 64  # Games kept warm at once; least recently used is dropped first
+SESSION_IDLE_TIMEOUT = 30 * 60  # Seconds
+MOVE_CACHE_SIZE = 4096  # Positions kept in memory
+MOVE_CACHE_PATH = os.environ.get('MOVE_CACHE_PATH')  # SQLite file to persist the cache; unset = memory only
+BOOK_PATH = os.environ.get('BOOK_PATH')  # Polyglot .bin opening book; unset = no book
+BOOK_MAX_DEPTH = int(os.environ.get('BOOK_MAX_DEPTH', '16'))  # Plies played from the book at most
+MINIMAX_TT_ENTRIES = 1 << 20  # Transposition table shared by all minimax searches
+MINIMAX_BATCH_ORDERING = os.environ.get('MINIMAX_BATCH_ORDERING', '0') == '1'  # Order quiet moves with batch_eval
+MINIMAX_WORKERS = int(os.environ.get('MINIMAX_WORKERS', '1'))  # >1 = lazy SMP over that many processes
+
+_pool = None
+_sessions = None
+_cache = None
+_book = None
+_parallel = None
+_minimax_tt = TranspositionTable(MINIMAX_TT_ENTRIES)
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    # Engines are spawned once and reused, so hash allocation and UCI handshake are paid at startup
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = EnginePool(STOCKFISH_PATH, size=ENGINE_POOL_SIZE, options=ENGINE_OPTIONS,
+                               command_timeout=REPLY_GRACE)
+        return _pool
+
+
+def get_parallel():
+    # Worker processes for the multi-core minimax search, with their shared transposition table
+    global _parallel
+    with _pool_lock:
+        if _parallel is None:
+            _parallel = ParallelSearch(MINIMAX_WORKERS, MINIMAX_TT_ENTRIES, MINIMAX_BATCH_ORDERING)
+        return _parallel
+
+
+def warm_up():
+    # Start engines (or minimax worker processes) ahead of the first request
+    if AI_ENGINE != 'minimax':
+        get_pool()
+    elif MINIMAX_WORKERS > 1:
+        get_parallel().warm_up()
+
+
+def engine_stats():
+    if AI_ENGINE == 'minimax':
+        if MINIMAX_WORKERS > 1:
+            return {'engine': 'minimax', 'workers': MINIMAX_WORKERS, 'tt_entries': len(get_parallel().tt)}
+        return {'engine': 'minimax', 'workers': 1, 'tt_entries': len(_minimax_tt)}
+    return get_pool().stats()
+
+
+def get_sessions():
+    global _sessions
+    with _pool_lock:
+        if _sessions is None:
+            _sessions = SessionManager(ENGINE_POOL_SIZE, MAX_SESSIONS, SESSION_IDLE_TIMEOUT)
+        return _sessions
+
+
+def get_cache():
+    global _cache
+    with _pool_lock:
+        if _cache is None:
+            _cache = MoveCache(MOVE_CACHE_SIZE, MOVE_CACHE_PATH)
+        return _cache
+
+
+def get_book():
+    global _book
+    with _pool_lock:
+        if _book is None:
+            _book = OpeningBook(BOOK_PATH, BOOK_MAX_DEPTH)
+        return _book
+
+
+def search_limit(movetime=None, depth=None, nodes=None):
+    # Any mix of limits is allowed; the search always carries a time cap so a reply fits the budget
+    budget_ms = min(movetime or MAX_MOVETIME_MS, MAX_MOVETIME_MS)
+    if depth is None and nodes is None and movetime is None:
+        depth = SEARCH_DEPTH
+    return chess.engine.Limit(time=max(budget_ms - MOVE_OVERHEAD_MS, 10) / 1000, depth=depth, nodes=nodes)
+
+
+def search_settings(limit):
+    # Part of the cache key: a move found at another depth/budget/strength is not the same answer
+    engine = 'minimax' if AI_ENGINE == 'minimax' else f"{os.path.basename(STOCKFISH_PATH)};skill={ENGINE_OPTIONS['Skill Level']}"
+    return f"{engine};time={limit.time};depth={limit.depth};nodes={limit.nodes}"
+
+
+def shutdown():
+    # Must run before interpreter shutdown: chess.engine keeps non-daemon threads per engine
+    global _pool, _cache, _book, _parallel
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+        if _parallel is not None:
+            _parallel.close()
+            _parallel = None
+        if _cache is not None:
+            _cache.close()
+            _cache = None
+        if _book is not None:
+            _book.close()
+            _book = None
+
+
+def predict_move(fen, session=None, limit=None):
+    # Returns (uci or None, rationale, search report for the response)
+    limit = limit or search_limit()
+    board = parse_board(fen)
+    book_move = get_book().pick(board)
+    if book_move is not None:
+        return book_move.uci(), "Straight from the opening book — a well-known line.", {'source': 'book'}
     rationale = "This develops my position while challenging yours."  # Simple — expand with engine info
-    return best_move, rationale
\ No newline at end of file
+    settings = search_settings(limit)
+    cached = get_cache().get(fen, settings)
+    if cached is not None:
+        print(f"DEBUG: Cache hit for {fen[:20]}... -> {cached}")
+        return cached, rationale, {'source': 'cache'}
+    if AI_ENGINE == 'minimax':
+        best_move, report = minimax_move(board, limit)
+    else:
+        best_move, report = uci_engine_move(fen, session, limit)
+    if report['source'] == 'fallback':
+        return best_move, "Thinking ran out of time — a safe move.", report
+    if best_move:
+        get_cache().put(fen, settings, best_move)
+    return best_move, rationale, report
+
+
+def minimax_engine():
+    # Runs in the request thread (or fans out to the worker processes); the transposition table
+    # carries over between moves and games
+    if MINIMAX_WORKERS > 1:
+        return get_parallel()
+    return MinimaxEngine(_minimax_tt, batch_ordering=MINIMAX_BATCH_ORDERING)
+
+
+def minimax_move(board, limit):
+    result = minimax_engine().search(board, depth=limit.depth, time_limit=limit.time, nodes=limit.nodes)
+    report = {
+        'source': 'minimax',
+        'depth': result.depth,
+        'nodes': result.nodes,
+        'time_ms': round(result.time * 1000),
+    }
+    return (result.move.uci() if result.move else None), report
+
+
+def uci_engine_move(fen, session, limit):
+    # With a session the game's pinned engine searches its board (with history) and keeps its hash
+    pinned = session is not None and session.board.fen() == fen
+    board, slot = (session.board, session.slot) if pinned else (parse_board(fen), None)
+    # Pondering needs the game's history on a pinned engine. After bestmove the engine keeps
+    # searching our move + its expected reply; if the human plays that reply chess.engine sends
+    # ponderhit on the next play() instead of stop, so the search picks up where it was.
+    ponder = PONDER and pinned
+    pondered = ponder and session.ponder_hit
+    start = time.perf_counter()
+    pool = get_pool()
+    try:
+        # The game's own engine if it is free, else any free one: waiting for it behind batch
+        # analysis or another game would spend the whole budget
+        with pool.engine(prefer=slot, timeout=limit.time) as engine:
+            if pinned and pool.slot_of(engine) != slot:
+                session.slot = pool.slot_of(engine)  # The game moves to this engine
+                pondered = False
+            # Time spent waiting for a free engine comes out of this move's budget
+            limit = dataclasses.replace(limit, time=max(limit.time - (time.perf_counter() - start), 0.01))
+            # Only a game's first search sends ucinewgame; anything else keeps the engine's game and hash
+            game = session.engine_game(engine.protocol.game) if pinned else engine.protocol.game
+            result = engine.play(board, limit, game=game, info=chess.engine.INFO_BASIC, ponder=ponder)
+    except ENGINE_FAILURES as e:
+        # Engine hung or crashed (the pool replaces it): still answer within the budget
+        print(f"DEBUG: Engine failed ({e!r}) — playing a safe move")
+        legal_moves = list(board.legal_moves)
+        report = {'source': 'fallback', 'time_ms': round((time.perf_counter() - start) * 1000)}
+        return (legal_moves[0].uci() if legal_moves else None), report
+    if ponder and result.ponder is not None:
+        session.ponder_move = result.ponder.uci()
+    report = {
+        'source': 'ponder' if pondered else 'engine',
+        'depth': result.info.get('depth'),
+        'nodes': result.info.get('nodes'),
+        'time_ms': round((time.perf_counter() - start) * 1000),
+    }
+    return (result.move.uci() if result.move else None), report
+
+
+def analyze_position(fen, limit=None):
+    # Best move and evaluation of one position for batch review (no book, cache or session).
+    # Scores are from White's point of view: centipawns, or moves to mate (negative = Black mates).
+    limit = limit or search_limit()
+    board = parse_board(fen)
+    start = time.perf_counter()
+    if board.is_game_over():
+        return {'best_move': None, 'score_cp': None, 'mate': None, 'depth': 0, 'nodes': 0, 'time_ms': 0,
+                'result': board.result()}
+    if AI_ENGINE == 'minimax':
+        result = minimax_engine().search(board, depth=limit.depth, time_limit=limit.time, nodes=limit.nodes)
+        score = result.score if board.turn == chess.WHITE else -result.score
+        score_cp, mate = round(score), None
+        if abs(score) >= MATE_SCORE - MAX_PLY:
+            plies = MATE_SCORE - abs(score)
+            score_cp, mate = None, (plies + 1) // 2 * (1 if score > 0 else -1)
+        best_move, depth, nodes = result.move, result.depth, result.nodes
+    else:
+        try:
+            with get_pool().engine() as engine:  # Queue behind other borrowers; the search keeps its full budget
+                # The engine's own game token: a pinned game's hash survives the analysis
+                info = engine.analyse(board, limit, game=engine.protocol.game,
+                                      info=chess.engine.INFO_BASIC | chess.engine.INFO_SCORE | chess.engine.INFO_PV)
+        except ENGINE_FAILURES as e:
+            print(f"DEBUG: Engine failed ({e!r}) during analysis")
+            return {'error': 'engine failed', 'time_ms': round((time.perf_counter() - start) * 1000)}
+        score = info['score'].white() if 'score' in info else None
+        score_cp = score.score() if score is not None else None
+        mate = score.mate() if score is not None else None
+        best_move = info['pv'][0] if info.get('pv') else None
+        depth, nodes = info.get('depth'), info.get('nodes')
+    return {
+        'best_move': best_move.uci() if best_move else None,
+        'score_cp': score_cp,
+        'mate': mate,
+        'depth': depth,
+        'nodes': nodes,
+        'time_ms': round((time.perf_counter() - start) * 1000),
+    }
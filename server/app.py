@@ -1,60 +1,184 @@
-from flask import Flask, request, jsonify
-from validation import validate_move
-from ai import predict_move
+from flask import Flask, Response, request, jsonify
+from validation import validate_move, parse_board
+from ai import (predict_move, search_limit, shutdown, get_sessions, get_cache, get_book, engine_stats,
+                analyze_position, ENGINE_POOL_SIZE)
+import io
+import json
+import time
 import chess
+import chess.pgn
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+
+MAX_BATCH_POSITIONS = 512  # Positions per /analyze_batch request (a long game is ~200)
 
 app = Flask(__name__)
+# Batch analysis gets its own threads, one fewer than there are engines: a long batch queues here
+# and always leaves a live move an engine to search on
+analysis_executor = ThreadPoolExecutor(max_workers=max(1, ENGINE_POOL_SIZE - 1), thread_name_prefix='analysis')
 
 @app.route('/validate_and_predict', methods=['POST'])
 def validate_and_predict():
-    data = request.json
+    return jsonify(complete_turn(start_turn(request.json)))
+
+def start_turn(data):
+    # Cheap part of a request (parse + validate); the async server runs this inline
     uci = data.get('move', '')
     fen = data.get('fen', chess.Board().fen())
+    game_id = data.get('game_id')  # Optional: pins the game to one warm engine between moves
+    session = get_sessions().get(game_id) if game_id else None
     
-    board = chess.Board(fen)
-    print(f"DEBUG: Server received user move: {uci}, initial FEN: {board.fen()}")
+    board = parse_board(fen)  # Parsed once; validate_move and the AI reply reuse it from the cache
+    print(f"DEBUG: Server received user move: {uci}, initial FEN: {board.fen()}, game: {game_id}")
     
     valid, new_fen, explanation = validate_move(uci, fen)
+    limit = search_limit(movetime=read_limit(data, 'movetime'), depth=read_limit(data, 'depth'),
+                         nodes=read_limit(data, 'nodes'))
+    return {'uci': uci, 'fen': fen, 'board': board, 'game_id': game_id, 'session': session,
+            'new_game': bool(data.get('new_game')), 'valid': valid, 'new_fen': new_fen, 'explanation': explanation, 'limit': limit}
+
+def read_limit(data, name):
+    # Optional search limits in the payload: movetime (ms), depth, nodes — ignored unless a positive int
+    value = data.get(name)
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return None
+    return value if value > 0 else None
+
+def complete_turn(turn):
+    # Engine part of a request; blocks for the search, so the async server runs it on an executor
+    session = turn['session']
+    explanation = turn['explanation']
+    if turn['valid']:
+        with session.lock if session is not None else nullcontext():  # One search per game at a time
+            if session is not None:
+                if turn['new_game']:
+                    session.new_game(turn['board'].fen())  # Under the lock: a search may still be using the board
+                session.sync(turn['board'].fen(), turn['uci'])
+            ai_uci, game_over, explanation, search = play_ai_reply(turn['new_fen'], explanation, session,
+                                                                   turn['limit'])
+    else:
+        # Leaves the session alone, so it takes no lock: the async server runs this on its event
+        # loop, which must never wait behind a search for the same game. A restart asked for here
+        # is picked up by the next valid move, whose sync restarts from the client's FEN.
+        ai_uci, search = None, None
+        game_over = turn['board'].is_game_over()
     
-    if valid:
-        # AI prediction on isolated copy
-        ai_board = chess.Board(new_fen)
-        print(f"DEBUG: AI board FEN before Stockfish: {ai_board.fen()}")
-        ai_uci, rationale = predict_move(ai_board.fen())
-        if ai_uci:
-            try:
-                ai_move = chess.Move.from_uci(ai_uci)
-                if ai_move in ai_board.legal_moves:
-                    ai_board.push(ai_move)
-                    explanation += f" AI counters with {ai_uci}: {rationale}"
-                    game_over = ai_board.is_game_over()
-                    print(f"DEBUG: AI move {ai_uci} valid, new FEN: {ai_board.fen()[:20]}...")
-                else:
-                    print(f"DEBUG: AI move {ai_uci} illegal — fallback random")
-                    legal_moves = list(ai_board.legal_moves)
-                    ai_uci = legal_moves[0].uci() if legal_moves else None
-                    game_over = ai_board.is_game_over()
-                    explanation += " AI adjusted to legal move."
-            except ValueError as e:
-                print(f"DEBUG: AI UCI parse error: {e} — fallback")
+    return {
+        'valid': turn['valid'],
+        'ai_move': ai_uci,
+        'fen': turn['new_fen'] if turn['valid'] else turn['fen'],
+        'game_over': game_over,
+        'explanation': explanation,
+        'game_id': turn['game_id'],
+        'search': search  # What was actually reached: source, depth, nodes, time_ms
+    }
+
+@app.route('/analyze_batch', methods=['POST'])
+def analyze_batch():
+    # Streams one NDJSON line per position as each finishes (in any order; 'index' gives the
+    # position), then a summary line with 'done': true
+    try:
+        jobs, limit = batch_jobs(request.json or {})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    def stream():
+        start = time.perf_counter()
+        futures = [analysis_executor.submit(analyze_job, job, limit) for job in jobs]
+        errors = 0
+        try:
+            for future in as_completed(futures):
+                line = future.result()
+                errors += 'error' in line
+                yield json.dumps(line) + '\n'
+        finally:
+            for future in futures:
+                future.cancel()  # Client went away: drop positions not started yet
+        yield json.dumps(batch_summary(len(jobs), errors, start)) + '\n'
+
+    return Response(stream(), mimetype='application/x-ndjson')
+
+def batch_jobs(data):
+    # Positions from 'fens' (a list) or 'pgn' (the position before every move of the main line,
+    # plus the final one); raises ValueError for a request that can't be analyzed at all
+    if data.get('pgn'):
+        game = chess.pgn.read_game(io.StringIO(data['pgn']))
+        if game is None:
+            raise ValueError("Could not parse PGN")
+        board = game.board()
+        jobs = []
+        for move in game.mainline_moves():
+            jobs.append({'index': len(jobs), 'fen': board.fen(), 'played': move.uci()})
+            board.push(move)
+        jobs.append({'index': len(jobs), 'fen': board.fen(), 'played': None})
+    elif isinstance(data.get('fens'), list) and data['fens']:
+        jobs = [{'index': index, 'fen': fen} for index, fen in enumerate(data['fens'])]
+    else:
+        raise ValueError("Send 'fens' (a list of FEN strings) or 'pgn'")
+    if len(jobs) > MAX_BATCH_POSITIONS:
+        raise ValueError(f"At most {MAX_BATCH_POSITIONS} positions per request")
+    limit = search_limit(movetime=read_limit(data, 'movetime'), depth=read_limit(data, 'depth'),
+                         nodes=read_limit(data, 'nodes'))
+    return jobs, limit
+
+def analyze_job(job, limit):
+    try:
+        return {**job, **analyze_position(job['fen'], limit)}
+    except (ValueError, TypeError):
+        return {**job, 'error': 'invalid FEN'}
+
+def batch_summary(positions, errors, start):
+    return {'done': True, 'positions': positions, 'errors': errors,
+            'time_ms': round((time.perf_counter() - start) * 1000)}
+
+@app.route('/stats', methods=['GET'])
+def stats():
+    return jsonify(server_stats())
+
+def server_stats():
+    return {
+        'book': get_book().stats(),
+        'cache': get_cache().stats(),
+        'engines': engine_stats(),
+        'sessions': get_sessions().stats()
+    }
+
+def play_ai_reply(new_fen, explanation, session=None, limit=None):
+    # AI prediction on isolated copy
+    ai_board = parse_board(new_fen)
+    print(f"DEBUG: AI board FEN before Stockfish: {ai_board.fen()}")
+    ai_uci, rationale, search = predict_move(ai_board.fen(), session, limit)
+    if ai_uci:
+        try:
+            ai_move = chess.Move.from_uci(ai_uci)
+            if ai_move in ai_board.legal_moves:
+                ai_board.push(ai_move)
+                explanation += f" AI counters with {ai_uci}: {rationale}"
+                game_over = ai_board.is_game_over()
+                print(f"DEBUG: AI move {ai_uci} valid, new FEN: {ai_board.fen()[:20]}...")
+            else:
+                print(f"DEBUG: AI move {ai_uci} illegal — fallback random")
                 legal_moves = list(ai_board.legal_moves)
                 ai_uci = legal_moves[0].uci() if legal_moves else None
                 game_over = ai_board.is_game_over()
-                explanation += " AI selected safe alternative."
-        else:
+                explanation += " AI adjusted to legal move."
+        except ValueError as e:
+            print(f"DEBUG: AI UCI parse error: {e} — fallback")
+            legal_moves = list(ai_board.legal_moves)
+            ai_uci = legal_moves[0].uci() if legal_moves else None
             game_over = ai_board.is_game_over()
-            explanation += " AI passed — your advantage!"
+            explanation += " AI selected safe alternative."
     else:
-        ai_uci = None
-        game_over = board.is_game_over()
-    
-    return jsonify({
-        'valid': valid,
-        'ai_move': ai_uci,
-        'fen': new_fen if valid else fen,
-        'game_over': game_over,
-        'explanation': explanation
-    })
+        game_over = ai_board.is_game_over()
+        explanation += " AI passed — your advantage!"
+    if session is not None and ai_uci:
+        session.push(ai_uci)  # Next request continues from here with "position startpos moves ..."
+    return ai_uci, game_over, explanation, search
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=8000, debug=True)
\ No newline at end of file
+    try:
+        app.run(host='0.0.0.0', port=8000, debug=True)
+    finally:
+        shutdown()  # Quit pooled engines and flush the move cache so the process can exit
\ No newline at end of file
@@ -0,0 +1,85 @@
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from aiohttp import web
+from app import (start_turn, complete_turn, server_stats, batch_jobs, analyze_job, batch_summary,
+                 analysis_executor)
+from ai import ENGINE_POOL_SIZE, warm_up, shutdown
+
+# asyncio entry point for hosts serving many boards: validation runs on the event loop,
+# engine searches are awaited on a thread pool, so a long search never holds up other boards.
+# Threads only wait on engines, so allow a queue of borrowers beyond the pool size.
+SEARCH_THREADS = ENGINE_POOL_SIZE * 4
+
+_executor = ThreadPoolExecutor(max_workers=SEARCH_THREADS, thread_name_prefix='search')
+
+
+async def validate_and_predict(request):
+    data = await request.json()
+    turn = start_turn(data)
+    if turn['valid']:
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(_executor, complete_turn, turn)
+    else:
+        response = complete_turn(turn)  # No search and no session lock: safe on the loop
+    return web.json_response(response)
+
+
+async def analyze_batch(request):
+    # Same NDJSON stream as the Flask endpoint; positions run on the app's analysis threads
+    try:
+        jobs, limit = batch_jobs(await request.json() or {})
+    except ValueError as e:
+        return web.json_response({'error': str(e)}, status=400)
+    response = web.StreamResponse(headers={'Content-Type': 'application/x-ndjson'})
+    await response.prepare(request)
+    start = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    futures = [loop.run_in_executor(analysis_executor, analyze_job, job, limit) for job in jobs]
+    errors = 0
+    try:
+        for next_done in asyncio.as_completed(futures):
+            line = await next_done
+            errors += 'error' in line
+            await response.write((json.dumps(line) + '\n').encode())
+    finally:
+        for future in futures:
+            future.cancel()  # Client went away: drop positions not started yet
+    await response.write((json.dumps(batch_summary(len(jobs), errors, start)) + '\n').encode())
+    await response.write_eof()
+    return response
+
+
+async def stats(request):
+    return web.json_response(server_stats())
+
+
+async def on_startup(app):
+    # Spawn engines before the first request instead of inside it
+    await asyncio.get_running_loop().run_in_executor(_executor, warm_up)
+
+
+async def on_cleanup(app):
+    _executor.shutdown(wait=True)
+    analysis_executor.shutdown(wait=True)
+    shutdown()
+
+
+def make_app():
+    app = web.Application()
+    app.router.add_post('/validate_and_predict', validate_and_predict)
+    app.router.add_post('/analyze_batch', analyze_batch)
+    app.router.add_get('/stats', stats)
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    return app
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+    web.run_app(make_app(), host=args.host, port=args.port)
@@ -0,0 +1,69 @@
+import numpy as np
+import chess
+from evaluation import (piece_square_value, KING_DEFENSE_WEIGHTS, KING_DEFENSE_SCALAR,
+                        KING_DEFENSE_INCREMENT, KING_DEFENSE_MAX_MOVES)
+
+# Vectorized version of evaluation.evaluate() for many positions at once. Positions are
+# 12 bitboards each (White pawn..king, then Black pawn..king), unpacked to (N, 12, 64) planes.
+PLANES = [(color, piece_type) for color in (chess.WHITE, chess.BLACK) for piece_type in chess.PIECE_TYPES]
+WHITE_KING, BLACK_KING = 5, 11
+
+PSQ_WEIGHTS = np.array([[piece_square_value(piece_type, color, square) for square in chess.SQUARES]
+                        for color, piece_type in PLANES], dtype=np.float64).reshape(12 * 64)
+DEFENSE_WEIGHTS = np.array([KING_DEFENSE_WEIGHTS[piece_type] for piece_type in chess.PIECE_TYPES], dtype=np.float64)
+KING_ZONES = np.array([[bool(chess.BB_KING_ATTACKS[king] & chess.BB_SQUARES[square]) for square in chess.SQUARES]
+                       for king in chess.SQUARES], dtype=np.float64)
+
+
+def bitboards_of(board):
+    black, white = board.occupied_co  # Indexed by color, so Black first
+    return [board.pawns & white, board.knights & white, board.bishops & white,
+            board.rooks & white, board.queens & white, board.kings & white,
+            board.pawns & black, board.knights & black, board.bishops & black,
+            board.rooks & black, board.queens & black, board.kings & black]
+
+
+def boards_to_bitboards(boards):
+    return np.array([bitboards_of(board) for board in boards], dtype='<u8').reshape(-1, 12)
+
+
+def bitboards_to_planes(bitboards):
+    # (N, 12) uint64 -> (N, 12, 64) 0/1, square a1 = bit 0
+    count = bitboards.shape[0]
+    as_bytes = np.ascontiguousarray(bitboards, dtype='<u8').view(np.uint8).reshape(count, 12, 8)
+    return np.unpackbits(as_bytes, axis=2, bitorder='little')
+
+
+def evaluate_batch(bitboards, fullmove_numbers):
+    # Same scores as evaluation.evaluate(), White's point of view, one entry per position
+    count = bitboards.shape[0]
+    if count == 0:
+        return np.zeros(0)
+    planes = bitboards_to_planes(bitboards).astype(np.float64)
+    score = planes.reshape(count, 12 * 64) @ PSQ_WEIGHTS
+
+    defense = []
+    for own, king_plane in ((slice(0, 6), WHITE_KING), (slice(6, 12), BLACK_KING)):
+        defenders = np.einsum('npq,p->nq', planes[:, own], DEFENSE_WEIGHTS)  # Weighted own pieces per square
+        zones = KING_ZONES[planes[:, king_plane].argmax(axis=1)]
+        has_king = planes[:, king_plane].any(axis=1)
+        defense.append((defenders * zones).sum(axis=1) * has_king)
+
+    timed = np.minimum(np.asarray(fullmove_numbers) - 1, KING_DEFENSE_MAX_MOVES) * KING_DEFENSE_INCREMENT
+    return score + KING_DEFENSE_SCALAR * timed * (defense[0] ** 2 - defense[1] ** 2)
+
+
+def evaluate_boards(boards):
+    return evaluate_batch(boards_to_bitboards(boards), [board.fullmove_number for board in boards])
+
+
+def evaluate_children(board, moves):
+    # Scores after each move, from the point of view of the side making it; the board is left unchanged
+    rows = []
+    for move in moves:
+        board.push(move)
+        rows.append(bitboards_of(board))
+        board.pop()
+    fullmove = board.fullmove_number + (1 if board.turn == chess.BLACK else 0)
+    scores = evaluate_batch(np.array(rows, dtype='<u8').reshape(-1, 12), fullmove)
+    return scores if board.turn == chess.WHITE else -scores
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# Checks batch_eval against evaluate() on random positions (exits non-zero on any mismatch),
+# then compares scoring all children of each node one board at a time vs in one NumPy batch.
+# Usage: python benchmarks/bench_batch_eval.py [--positions 2000] [--seed 1]
+import argparse
+import os
+import random
+import sys
+import time
+import chess
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from evaluation import evaluate
+from batch_eval import boards_to_bitboards, evaluate_batch, evaluate_boards, evaluate_children
+
+
+def random_positions(count, rng):
+    positions = []
+    while len(positions) < count:
+        board = chess.Board()
+        for _ in range(rng.randint(0, 120)):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+        if not board.is_game_over():
+            positions.append(board)
+    return positions
+
+
+def check(positions):
+    expected = np.array([evaluate(board) for board in positions])
+    got = evaluate_boards(positions)
+    bad = np.flatnonzero(~np.isclose(expected, got))
+    assert not bad.size, f"mismatch at {positions[bad[0]].fen()}: {expected[bad[0]]} != {got[bad[0]]}"
+    for board in positions[:200]:
+        moves = list(board.legal_moves)
+        sign = 1 if board.turn == chess.WHITE else -1
+        scalar = []
+        for move in moves:
+            board.push(move)
+            scalar.append(sign * evaluate(board))
+            board.pop()
+        assert np.allclose(scalar, evaluate_children(board, moves)), f"children mismatch at {board.fen()}"
+
+
+def bench_children(positions):
+    start = time.perf_counter()
+    children = 0
+    for board in positions:
+        for move in list(board.legal_moves):
+            board.push(move)
+            evaluate(board)
+            board.pop()
+            children += 1
+    scalar = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for board in positions:
+        evaluate_children(board, list(board.legal_moves))
+    batched = time.perf_counter() - start
+    return children, scalar, batched
+
+
+def bench_array(positions, repeat=20):
+    # Pure scoring throughput once positions are already bitboards
+    bitboards = boards_to_bitboards(positions)
+    fullmove = np.array([board.fullmove_number for board in positions])
+    start = time.perf_counter()
+    for _ in range(repeat):
+        evaluate_batch(bitboards, fullmove)
+    return len(positions) * repeat / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--positions', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    positions = random_positions(args.positions, random.Random(args.seed))
+
+    check(positions)
+    print(f"OK: batch == scalar evaluation at {len(positions)} positions")
+
+    children, scalar, batched = bench_children(positions)
+    print(f"{children} children  scalar {children / scalar:9.0f} pos/s  "
+          f"batch {children / batched:9.0f} pos/s  ({scalar / batched:.1f}x)")
+    print(f"bitboards already built: {bench_array(positions):.0f} pos/s")
+
+
+if __name__ == '__main__':
+    main()
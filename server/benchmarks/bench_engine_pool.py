@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# Per-request latency: new engine per move (old predict_move) vs. warm EnginePool.
+# Usage: python benchmarks/bench_engine_pool.py [--requests 30] [--engine "stockfish"]
+import argparse
+import os
+import statistics
+import sys
+import time
+import chess
+import chess.engine
+
+# Server modules are imported flat (run from server/), same as app.py
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine_pool import EnginePool
+from ai import ENGINE_OPTIONS
+
+FAKE_ENGINE = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fake_uci_engine.py')]
+DEPTH = 10
+
+
+def sample_positions(count):
+    board = chess.Board()
+    fens = []
+    while len(fens) < count:
+        if board.is_game_over():
+            board = chess.Board()
+        fens.append(board.fen())
+        board.push(sorted(board.legal_moves, key=lambda m: m.uci())[len(fens) % board.legal_moves.count()])
+    return fens
+
+
+def spawn_per_request(command, fen):
+    engine = chess.engine.SimpleEngine.popen_uci(command)
+    try:
+        engine.configure(ENGINE_OPTIONS)
+        return engine.play(chess.Board(fen), chess.engine.Limit(depth=DEPTH)).move
+    finally:
+        engine.quit()
+
+
+def pooled(pool, fen):
+    with pool.engine() as engine:
+        return engine.play(chess.Board(fen), chess.engine.Limit(depth=DEPTH)).move
+
+
+def report(name, timings):
+    timings = sorted(t * 1000 for t in timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{name:<20} mean {statistics.mean(timings):8.1f} ms   p50 {statistics.median(timings):8.1f} ms   "
+          f"p95 {p95:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=30)
+    parser.add_argument('--engine', help="UCI engine command (default: fake_uci_engine.py)")
+    args = parser.parse_args()
+    command = args.engine.split() if args.engine else FAKE_ENGINE
+    fens = sample_positions(args.requests)
+
+    before = []
+    for fen in fens:
+        start = time.perf_counter()
+        spawn_per_request(command, fen)
+        before.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    pool = EnginePool(command, size=1, options=ENGINE_OPTIONS)
+    warmup = time.perf_counter() - start
+    after = []
+    try:
+        for fen in fens:
+            start = time.perf_counter()
+            pooled(pool, fen)
+            after.append(time.perf_counter() - start)
+    finally:
+        pool.close()
+
+    print(f"{args.requests} requests, depth {DEPTH}, engine: {' '.join(command)}")
+    report("spawn per request", before)
+    report("engine pool", after)
+    print(f"(pool warm-up paid once at startup: {warmup * 1000:.1f} ms)")
+
+
+if __name__ == '__main__':
+    main()
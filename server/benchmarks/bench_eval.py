@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# Compares leaf-evaluation throughput of IncrementalEvaluator and evaluate(); that the two agree
+# is checked by test_evaluation.py.
+# Usage: python benchmarks/bench_eval.py [--seed 1]
+import argparse
+import os
+import random
+import sys
+import time
+import chess
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from evaluation import IncrementalEvaluator, evaluate
+
+
+def random_playout(rng, max_plies=200):
+    board = chess.Board()
+    moves = []
+    while not board.is_game_over() and len(moves) < max_plies:
+        move = rng.choice(list(board.legal_moves))
+        board.push(move)
+        moves.append(move)
+    return moves
+
+
+def bench_leaves(positions):
+    # Leaf pattern of a search: make a move, evaluate, unmake
+    start = time.perf_counter()
+    leaves = 0
+    for board in positions:
+        for move in list(board.legal_moves):
+            board.push(move)
+            evaluate(board)
+            board.pop()
+            leaves += 1
+    full = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for board in positions:
+        evaluator = IncrementalEvaluator(board)
+        for move in list(board.legal_moves):
+            evaluator.push(board, move)
+            evaluator.evaluate(board)
+            evaluator.pop(board)
+    incremental = time.perf_counter() - start
+    return leaves, full, incremental
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    positions = []
+    for _ in range(50):
+        board = chess.Board()
+        for move in random_playout(rng, max_plies=rng.randint(10, 60)):
+            board.push(move)
+        if not board.is_game_over():
+            positions.append(board)
+    leaves, full, incremental = bench_leaves(positions)
+    print(f"{leaves} leaves  from-scratch {leaves / full:9.0f} leaves/s  "
+          f"incremental {leaves / incremental:9.0f} leaves/s  ({full / incremental:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
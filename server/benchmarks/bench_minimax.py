@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# Nodes per second of the in-process minimax engine on fixed positions.
+# Usage: python benchmarks/bench_minimax.py [--depth 4] [--time 5] [--batch-ordering]
+import argparse
+import os
+import sys
+import chess
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from minimax import MinimaxEngine
+
+POSITIONS = {
+    'start': chess.STARTING_FEN,
+    'italian': 'r1bqk1nr/pppp1ppp/2n5/2b1p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4',
+    'kiwipete': 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+    'middlegame': 'r2q1rk1/pp2bppp/2n1pn2/2pp4/3P1B2/2PBPN2/PP1N1PPP/R2QK2R w KQ - 0 9',
+    'endgame': '8/2k5/3p4/p2P1p2/P2P1P2/8/3K4/8 w - - 0 1',
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--depth', type=int, default=4)
+    parser.add_argument('--time', type=float, default=10.0, help="Per-position cap in seconds")
+    parser.add_argument('--batch-ordering', action='store_true', help="Order quiet moves with batch_eval")
+    args = parser.parse_args()
+
+    total_nodes = 0
+    total_time = 0.0
+    print(f"{'position':<12} {'depth':>5} {'nodes':>9} {'time s':>8} {'nps':>9}  move")
+    for name, fen in POSITIONS.items():
+        result = MinimaxEngine(batch_ordering=args.batch_ordering).search(chess.Board(fen), depth=args.depth, time_limit=args.time)
+        total_nodes += result.nodes
+        total_time += result.time
+        print(f"{name:<12} {result.depth:>5} {result.nodes:>9} {result.time:>8.2f} "
+              f"{result.nodes / max(result.time, 1e-9):>9.0f}  {result.move}")
+    print(f"{'total':<12} {'':>5} {total_nodes:>9} {total_time:>8.2f} {total_nodes / max(total_time, 1e-9):>9.0f}")
+
+
+if __name__ == '__main__':
+    main()
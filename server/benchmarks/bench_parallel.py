@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# Scaling of the lazy SMP minimax search: nodes/sec and time to reach a fixed depth on the
+# bench_minimax positions, for each worker count (a fresh shared table per count).
+# Usage: python benchmarks/bench_parallel.py [--workers 1 2 4 8] [--depth 5] [--time 30]
+import argparse
+import os
+import sys
+import chess
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_minimax import POSITIONS
+from parallel_search import ParallelSearch
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--depth', type=int, default=5)
+    parser.add_argument('--time', type=float, default=30.0, help="Per-position cap in seconds")
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs")
+    print(f"{'workers':>7} {'nodes':>9} {'nps':>9} {'time s':>8} {'speedup':>7}  depths reached")
+    baseline = None
+    for workers in args.workers:
+        search = ParallelSearch(workers, tt_entries=1 << 18)
+        try:
+            search.warm_up()
+            nodes, elapsed, depths = 0, 0.0, []
+            for fen in POSITIONS.values():
+                result = search.search(chess.Board(fen), depth=args.depth, time_limit=args.time)
+                nodes += result.nodes
+                elapsed += result.time
+                depths.append(result.depth)
+        finally:
+            search.close()
+        baseline = baseline or elapsed
+        print(f"{workers:>7} {nodes:>9} {nodes / elapsed:>9.0f} {elapsed:>8.2f} {baseline / elapsed:>6.2f}x  {depths}")
+
+
+if __name__ == '__main__':
+    main()
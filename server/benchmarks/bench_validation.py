@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# Throughput of validate_move against the old parse-every-time version, on a mix of legal and
+# illegal moves from random positions: cold (every FEN new) and warm (FENs seen before, as when
+# a board retries a move or several requests share a position).
+# Usage: python benchmarks/bench_validation.py [--positions 200] [--rounds 5]
+import argparse
+import os
+import random
+import sys
+import time
+import chess
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import validation
+from validation import validate_move, parse_board
+
+
+def validate_move_uncached(uci, fen):
+    # validate_move as it was: a fresh Board per call and a second legality check for the reason
+    board = chess.Board(fen)
+    try:
+        move = chess.Move.from_uci(uci)
+        if move in board.legal_moves:
+            board.push(move)
+            return True, board.fen(), "Move accepted — strategic choice!"
+        else:
+            reason = old_illegal_reason(board, move)
+            return False, board.fen(), f"Invalid: {reason}"
+    except ValueError:
+        return False, fen, "Invalid UCI format — use 'e2e4' style."
+
+
+def old_illegal_reason(board, move):
+    # get_illegal_reason before the diagnostics, kept so "old" measures the old code path
+    if move not in board.legal_moves:
+        piece = board.piece_at(move.from_square)
+        if piece and piece.piece_type == chess.PAWN:
+            if move.to_square < move.from_square and piece.color == chess.WHITE:
+                return "Pawns can't retreat — advance only."
+        return "Blocked path or illegal for piece type."
+    return "Unknown error."
+
+
+def request_uncached(uci, fen):
+    # Board work of one /validate_and_predict request before this cache: start_turn, validation
+    # and play_ai_reply each parsed their own Board
+    board = chess.Board(fen)
+    valid, new_fen, _ = validate_move_uncached(uci, fen)
+    if valid:
+        chess.Board(new_fen).fen()
+    return board
+
+
+def request_cached(uci, fen):
+    board = parse_board(fen)
+    valid, new_fen, _ = validate_move(uci, fen)
+    if valid:
+        parse_board(new_fen).fen()
+    return board
+
+
+def cold(function):
+    # Every request on a position the cache has not seen (reuse within the request still counts)
+    def run(uci, fen):
+        validation._boards.clear()
+        return function(uci, fen)
+    return run
+
+
+def make_requests(count, rng):
+    requests = []
+    while len(requests) < count:
+        board = chess.Board()
+        for _ in range(rng.randint(0, 80)):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+        moves = list(board.legal_moves)
+        if not moves:
+            continue
+        fen = board.fen()
+        requests.append((rng.choice(moves).uci(), fen))
+        requests.append((chess.Move(rng.randrange(64), rng.randrange(64)).uci(), fen))  # Mostly illegal
+    return requests
+
+
+def rate(function, requests, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for uci, fen in requests:
+            function(uci, fen)
+    return len(requests) * rounds / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--positions', type=int, default=200)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    requests = make_requests(args.positions, random.Random(args.seed))
+
+    for uci, fen in requests:
+        assert validate_move(uci, fen)[:2] == validate_move_uncached(uci, fen)[:2], f"{uci} on {fen}"
+    print(f"OK: same results on {len(requests)} requests")
+
+    validation.BOARD_CACHE_SIZE = len(requests) * 2  # Warm runs see every position again
+    for name, old_function, function in (('validate_move', validate_move_uncached, validate_move),
+                                         ('whole request', request_uncached, request_cached)):
+        old = rate(old_function, requests, args.rounds)
+        cold_rate = rate(cold(function), requests, args.rounds)
+        warm = rate(function, requests, args.rounds)
+        print(f"{name:<14} old {old:8.0f}/s  cold {cold_rate:8.0f}/s ({cold_rate / old:.1f}x)  "
+              f"warm {warm:8.0f}/s ({warm / old:.1f}x)")
+
+    # Noisy vision input: random from/to pairs (and promotions), almost all illegal
+    rng = random.Random(args.seed)
+    boards = {fen: parse_board(fen) for _, fen in requests}
+    legal = {fen: frozenset(board.legal_moves) for fen, board in boards.items()}  # Once per position, as in validate_move
+    noisy = [(chess.Move(rng.randrange(64), rng.randrange(64), rng.choice([None, None, None, chess.QUEEN])), fen)
+             for fen in boards for _ in range(20)]
+    worst = 0.0
+    start = time.perf_counter()
+    for move, fen in noisy:
+        call = time.perf_counter()
+        validation.get_illegal_reason(boards[fen], move, legal[fen])
+        worst = max(worst, time.perf_counter() - call)
+    per_call = (time.perf_counter() - start) / len(noisy)
+    print(f"illegal-move reasons: {per_call * 1e6:.0f} us/call, worst {worst * 1e6:.0f} us ({len(noisy)} moves)")
+
+
+if __name__ == '__main__':
+    main()
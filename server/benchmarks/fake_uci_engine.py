@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# Stand-in UCI engine for benchmarks: speaks enough UCI for chess.engine and
+# fakes the costs of a real Stockfish (process start, hash allocation, search).
+import argparse
+import sys
+import threading
+import time
+import chess
+
+parser = argparse.ArgumentParser()
+parser.add_argument('--startup-ms', type=float, default=150)  # Binary load + NNUE init
+parser.add_argument('--hash-ms-per-mb', type=float, default=0.4)  # Hash table allocation
+parser.add_argument('--ms-per-depth', type=float, default=4)  # Search cost per ply
+parser.add_argument('--nps', type=int, default=500000)
+args = parser.parse_args()
+
+time.sleep(args.startup_ms / 1000)
+
+board = chess.Board()
+search_thread = None
+stop_event = threading.Event()
+ponderhit_event = threading.Event()
+write_lock = threading.Lock()
+
+
+def send(line):
+    with write_lock:
+        sys.stdout.write(line + '\n')
+        sys.stdout.flush()
+
+
+def pick_move(position):
+    moves = sorted(position.legal_moves, key=lambda m: (not position.is_capture(m), m.uci()))
+    return moves[0] if moves else None
+
+
+def parse_go(tokens):
+    limit = {}
+    i = 0
+    while i < len(tokens):
+        if tokens[i] in ('depth', 'movetime', 'nodes', 'wtime', 'btime'):
+            limit[tokens[i]] = int(tokens[i + 1])
+            i += 2
+        else:
+            limit[tokens[i]] = True
+            i += 1
+    return limit
+
+
+def search_budget(limit):
+    # Like a real engine, stop at whichever of movetime / nodes / depth is reached first
+    budgets = []
+    if 'movetime' in limit:
+        budgets.append(limit['movetime'] / 1000)
+    if 'nodes' in limit:
+        budgets.append(limit['nodes'] / args.nps)
+    if 'depth' in limit or not budgets:
+        budgets.append(limit.get('depth', 15) * args.ms_per_depth / 1000)
+    return min(budgets)
+
+
+def search(position, limit):
+    start = time.perf_counter()
+    if limit.get('ponder') or limit.get('infinite'):
+        # Wait for ponderhit/stop; pondered time counts towards the real search.
+        while not stop_event.is_set() and not ponderhit_event.is_set():
+            time.sleep(0.001)
+    deadline = start + search_budget(limit)
+    while not stop_event.is_set() and time.perf_counter() < deadline:
+        time.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    move = pick_move(position)
+    nodes = int(elapsed * args.nps)
+    reached = max(1, int(elapsed * 1000 / max(args.ms_per_depth, 0.001)))
+    reached = min(reached, limit.get('depth', reached))
+    if move is None:
+        send("info depth 0 score mate 0")
+        send("bestmove (none)")
+        return
+    send(f"info depth {reached} seldepth {reached} nodes {nodes} nps {args.nps} "
+         f"time {int(elapsed * 1000)} score cp 0 pv {move.uci()}")
+    position.push(move)
+    reply = pick_move(position)
+    send(f"bestmove {move.uci()}" + (f" ponder {reply.uci()}" if reply else ''))
+
+
+def set_position(tokens):
+    global board
+    if tokens[0] == 'startpos':
+        board = chess.Board()
+        rest = tokens[1:]
+    else:
+        moves_at = tokens.index('moves') if 'moves' in tokens else len(tokens)
+        board = chess.Board(' '.join(tokens[1:moves_at]))
+        rest = tokens[moves_at:]
+    if rest and rest[0] == 'moves':
+        for uci in rest[1:]:
+            board.push_uci(uci)
+
+
+for raw in sys.stdin:
+    tokens = raw.split()
+    if not tokens:
+        continue
+    cmd = tokens[0]
+    if cmd == 'uci':
+        send("id name FakeFish 1.0")
+        send("id author benchmarks")
+        send("option name Threads type spin default 1 min 1 max 512")
+        send("option name Hash type spin default 16 min 1 max 33554432")
+        send("option name Skill Level type spin default 20 min 0 max 20")
+        send("option name Ponder type check default false")
+        send("option name MultiPV type spin default 1 min 1 max 500")
+        send("uciok")
+    elif cmd == 'setoption':
+        if 'Hash' in tokens and 'value' in tokens:
+            time.sleep(int(tokens[tokens.index('value') + 1]) * args.hash_ms_per_mb / 1000)
+    elif cmd == 'isready':
+        send("readyok")
+    elif cmd == 'ucinewgame':
+        board = chess.Board()
+    elif cmd == 'position':
+        set_position(tokens[1:])
+    elif cmd == 'go':
+        stop_event.clear()
+        ponderhit_event.clear()
+        search_thread = threading.Thread(target=search, args=(board.copy(), parse_go(tokens[1:])), daemon=True)
+        search_thread.start()
+    elif cmd == 'ponderhit':
+        ponderhit_event.set()
+    elif cmd == 'stop':
+        stop_event.set()
+        if search_thread is not None:
+            search_thread.join()
+    elif cmd == 'quit':
+        stop_event.set()
+        break
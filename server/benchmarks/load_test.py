@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# Drives N simulated boards against /validate_and_predict and reports latency percentiles and throughput.
+# By default starts the server itself on a spare port with fake_uci_engine.py as the engine.
+# Usage: python benchmarks/load_test.py --clients 16 --moves 10 [--server async|flask] [--url http://host:8000]
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+import aiohttp
+import chess
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FAKE_ENGINE = os.path.join(SERVER_DIR, 'benchmarks', 'fake_uci_engine.py')
+SERVER_COMMANDS = {
+    'async': lambda port: [sys.executable, 'async_app.py', '--host', '127.0.0.1', '--port', str(port)],
+    'flask': lambda port: [sys.executable, '-c',
+                           f"from app import app; app.run(host='127.0.0.1', port={port}, threaded=True)"],
+}
+
+
+def start_server(kind, port, pool_size):
+    env = dict(os.environ, STOCKFISH_PATH=FAKE_ENGINE, ENGINE_POOL_SIZE=str(pool_size))
+    env.pop('MOVE_CACHE_PATH', None)
+    env.pop('BOOK_PATH', None)
+    return subprocess.Popen(SERVER_COMMANDS[kind](port), cwd=SERVER_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+async def wait_ready(http, url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            async with http.get(f'{url}/stats') as response:
+                if response.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not come up")
+
+
+async def play_board(http, url, moves, seed, latencies):
+    rng = random.Random(seed)
+    board = chess.Board()
+    game_id = uuid.uuid4().hex
+    new_game = True
+    for _ in range(moves):
+        if board.is_game_over():
+            board, new_game = chess.Board(), True
+        move = rng.choice(list(board.legal_moves)).uci()
+        payload = {'move': move, 'fen': board.fen(), 'game_id': game_id, 'new_game': new_game}
+        start = time.perf_counter()
+        async with http.post(f'{url}/validate_and_predict', json=payload) as response:
+            data = await response.json()
+        latencies.append(time.perf_counter() - start)
+        new_game = False
+        board.push_uci(move)
+        if data.get('ai_move'):
+            board.push_uci(data['ai_move'])
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+async def run(args):
+    url = args.url or f'http://127.0.0.1:{args.port}'
+    server = None if args.url else start_server(args.server, args.port, args.pool_size)
+    try:
+        timeout = aiohttp.ClientTimeout(total=120)
+        connector = aiohttp.TCPConnector(limit=args.clients)
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector) as http:
+            await wait_ready(http, url)
+            latencies = []
+            start = time.perf_counter()
+            await asyncio.gather(*(play_board(http, url, args.moves, seed, latencies)
+                                   for seed in range(args.clients)))
+            elapsed = time.perf_counter() - start
+            async with http.get(f'{url}/stats') as response:
+                server_stats = await response.json()
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    ms = [t * 1000 for t in latencies]
+    print(f"server={'external ' + url if args.url else args.server} clients={args.clients} "
+          f"moves/client={args.moves} engines={args.pool_size}")
+    print(f"requests {len(ms)}  throughput {len(ms) / elapsed:.1f} req/s  "
+          f"p50 {statistics.median(ms):.1f} ms  p99 {percentile(ms, 99):.1f} ms  max {max(ms):.1f} ms")
+    print(f"cache {server_stats['cache']}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--moves', type=int, default=10)
+    parser.add_argument('--server', choices=sorted(SERVER_COMMANDS), default='async')
+    parser.add_argument('--pool-size', type=int, default=4)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--url', help="Benchmark an already running server instead")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
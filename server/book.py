@@ -0,0 +1,50 @@
+import os
+import random
+import threading
+import chess
+import chess.polyglot
+
+
+class OpeningBook:
+    def __init__(self, path=None, max_depth=16, seed=None):
+        self.path = path
+        self.max_depth = max_depth  # Plies from the start position after which the book is ignored
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()  # random.Random is shared between request threads
+        self._reader = None
+        self.hits = 0
+        self.misses = 0
+        if path and os.path.exists(path):
+            # MemoryMappedReader binary-searches the sorted Zobrist keys in the mmap — the file is never read whole
+            self._reader = chess.polyglot.open_reader(path)
+            print(f"DEBUG: Opening book loaded from {path}")
+        elif path:
+            print(f"DEBUG: Opening book {path} not found — book disabled")
+
+    @property
+    def enabled(self):
+        return self._reader is not None
+
+    def pick(self, board):
+        if self._reader is None or board.ply() >= self.max_depth:
+            return None
+        with self._lock:
+            try:
+                entry = self._reader.weighted_choice(board, random=self.random)
+            except IndexError:  # Out of book
+                self.misses += 1
+                return None
+            if entry.move not in board.legal_moves:
+                # Key collision or corrupt entry: let the engine decide
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry.move
+
+    def stats(self):
+        return {'enabled': self.enabled, 'hits': self.hits, 'misses': self.misses, 'max_depth': self.max_depth}
+
+    def close(self):
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
@@ -0,0 +1,104 @@
+import threading
+from contextlib import contextmanager
+import chess.engine
+
+# Errors that mean the engine process is gone or wedged and must be replaced
+ENGINE_FAILURES = (chess.engine.EngineTerminatedError, chess.engine.EngineError, TimeoutError, OSError)
+
+
+class EnginePool:
+    def __init__(self, command, size=2, options=None, timeout=10.0, command_timeout=None):
+        self.command = command
+        self.size = size
+        self.options = options or {}
+        self.timeout = timeout  # Seconds for UCI handshake
+        self.command_timeout = command_timeout or timeout  # Seconds for later commands, on top of a search's time limit
+        self._cond = threading.Condition()
+        self._slots = []  # Slot index -> engine; a slot keeps its index across restarts
+        self._idle = []  # Free slot indices, most recently used (warmest) last
+        self.restarts = 0
+        self.closed = False
+        for slot in range(size):
+            self._slots.append(self._spawn(slot))
+            self._idle.append(slot)
+
+    def _spawn(self, slot):
+        engine = chess.engine.SimpleEngine.popen_uci(self.command, timeout=self.timeout)
+        engine.configure(self.options)
+        engine.timeout = self.command_timeout
+        print(f"DEBUG: Engine pool started {engine.id.get('name', self.command)} in slot {slot + 1}/{self.size}")
+        return engine
+
+    def _restart(self, slot):
+        print(f"DEBUG: Engine in slot {slot + 1} unhealthy — restarting")
+        try:
+            self._slots[slot].close()
+        except Exception:
+            pass  # Already dead
+        self.restarts += 1
+        self._slots[slot] = self._spawn(slot)
+        return self._slots[slot]
+
+    def is_healthy(self, engine):
+        # Process check only: a ping (isready) would cancel a ponder search left running on the engine.
+        # Hung engines are caught by the per-command timeout instead.
+        try:
+            return not engine.protocol.returncode.done()
+        except ENGINE_FAILURES:
+            return False
+
+    def _acquire(self, slot, timeout, prefer=None):
+        with self._cond:
+            if slot is None:
+                ready = self._cond.wait_for(lambda: self._idle or self.closed, timeout)
+            else:
+                ready = self._cond.wait_for(lambda: slot in self._idle or self.closed, timeout)
+            if self.closed:
+                raise RuntimeError("Engine pool is closed")
+            if not ready:
+                raise TimeoutError("No engine free within timeout")
+            if slot is None:
+                slot = prefer if prefer in self._idle else self._idle[-1]
+            self._idle.remove(slot)
+            return slot
+
+    def _release(self, slot):
+        with self._cond:
+            self._idle.append(slot)
+            self._cond.notify_all()
+
+    @contextmanager
+    def engine(self, slot=None, timeout=None, prefer=None):
+        # Borrow an engine exclusively (a specific slot if given; else the prefer slot when it is
+        # free, or any free one); blocks until it is free
+        slot = self._acquire(slot, timeout, prefer)
+        try:
+            engine = self._slots[slot]
+            if not self.is_healthy(engine):
+                engine = self._restart(slot)
+            yield engine
+        except ENGINE_FAILURES:
+            # Crashed or hung mid-search: kill it now, the next borrower's health check respawns it.
+            # Respawning here would make the caller wait for a new process before it can reply.
+            self._slots[slot].close()
+            raise
+        finally:
+            self._release(slot)
+
+    def slot_of(self, engine):
+        return self._slots.index(engine)
+
+    def stats(self):
+        with self._cond:
+            idle = len(self._idle)
+        return {'size': self.size, 'idle': idle, 'restarts': self.restarts}
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+        for engine in self._slots:
+            try:
+                engine.quit()
+            except Exception:
+                engine.close()
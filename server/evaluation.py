@@ -0,0 +1,174 @@
+import chess
+
+# README evaluation: a linear term (weighted pieces, here with piece-square bonuses) plus a
+# non-linear king defense term: the weighted pieces around each king are summed, squared,
+# scaled by a small scalar and by the "timed king defense" n * x, where n counts moves played.
+PIECE_VALUES = {
+    chess.PAWN: 100,
+    chess.KNIGHT: 320,
+    chess.BISHOP: 330,
+    chess.ROOK: 500,
+    chess.QUEEN: 900,
+    chess.KING: 0,
+}
+
+# How much each piece counts as a defender when standing next to its own king
+KING_DEFENSE_WEIGHTS = {
+    chess.PAWN: 3,
+    chess.KNIGHT: 2,
+    chess.BISHOP: 2,
+    chess.ROOK: 1,
+    chess.QUEEN: 1,
+    chess.KING: 0,
+}
+KING_DEFENSE_SCALAR = 0.5
+KING_DEFENSE_INCREMENT = 0.1  # x: grows the defense term each move so it matters by the middlegame
+KING_DEFENSE_MAX_MOVES = 30  # n stops growing here so the term can't swamp material in long games
+
+# Piece-square bonuses from White's point of view, a1 = index 0 (rank 1 first)
+PIECE_SQUARE_TABLES = {
+    chess.PAWN: [
+        0, 0, 0, 0, 0, 0, 0, 0,
+        5, 10, 10, -20, -20, 10, 10, 5,
+        5, -5, -10, 0, 0, -10, -5, 5,
+        0, 0, 0, 20, 20, 0, 0, 0,
+        5, 5, 10, 25, 25, 10, 5, 5,
+        10, 10, 20, 30, 30, 20, 10, 10,
+        50, 50, 50, 50, 50, 50, 50, 50,
+        0, 0, 0, 0, 0, 0, 0, 0,
+    ],
+    chess.KNIGHT: [
+        -50, -40, -30, -30, -30, -30, -40, -50,
+        -40, -20, 0, 5, 5, 0, -20, -40,
+        -30, 5, 10, 15, 15, 10, 5, -30,
+        -30, 0, 15, 20, 20, 15, 0, -30,
+        -30, 5, 15, 20, 20, 15, 5, -30,
+        -30, 0, 10, 15, 15, 10, 0, -30,
+        -40, -20, 0, 0, 0, 0, -20, -40,
+        -50, -40, -30, -30, -30, -30, -40, -50,
+    ],
+    chess.BISHOP: [
+        -20, -10, -10, -10, -10, -10, -10, -20,
+        -10, 5, 0, 0, 0, 0, 5, -10,
+        -10, 10, 10, 10, 10, 10, 10, -10,
+        -10, 0, 10, 10, 10, 10, 0, -10,
+        -10, 5, 5, 10, 10, 5, 5, -10,
+        -10, 0, 5, 10, 10, 5, 0, -10,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -20, -10, -10, -10, -10, -10, -10, -20,
+    ],
+    chess.ROOK: [
+        0, 0, 0, 5, 5, 0, 0, 0,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        5, 10, 10, 10, 10, 10, 10, 5,
+        0, 0, 0, 0, 0, 0, 0, 0,
+    ],
+    chess.QUEEN: [
+        -20, -10, -10, -5, -5, -10, -10, -20,
+        -10, 0, 5, 0, 0, 0, 0, -10,
+        -10, 5, 5, 5, 5, 5, 0, -10,
+        0, 0, 5, 5, 5, 5, 0, -5,
+        -5, 0, 5, 5, 5, 5, 0, -5,
+        -10, 0, 5, 5, 5, 5, 0, -10,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -20, -10, -10, -5, -5, -10, -10, -20,
+    ],
+    chess.KING: [
+        20, 30, 10, 0, 0, 10, 30, 20,
+        20, 20, 0, 0, 0, 0, 20, 20,
+        -10, -20, -20, -20, -20, -20, -20, -10,
+        -20, -30, -30, -40, -40, -30, -30, -20,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+    ],
+}
+
+
+def piece_square_value(piece_type, color, square):
+    # Material plus placement, signed: positive for White
+    if color == chess.WHITE:
+        return PIECE_VALUES[piece_type] + PIECE_SQUARE_TABLES[piece_type][square]
+    return -(PIECE_VALUES[piece_type] + PIECE_SQUARE_TABLES[piece_type][chess.square_mirror(square)])
+
+
+def timed_king_defense(board):
+    # n * x, with n the number of moves played so far
+    return min(board.fullmove_number - 1, KING_DEFENSE_MAX_MOVES) * KING_DEFENSE_INCREMENT
+
+
+def king_defense(board, color):
+    king = board.king(color)
+    if king is None:
+        return 0
+    total = 0
+    for square in chess.SquareSet(chess.BB_KING_ATTACKS[king] & board.occupied_co[color]):
+        total += KING_DEFENSE_WEIGHTS[board.piece_type_at(square)]
+    return total
+
+
+def evaluate(board):
+    # Static score in centipawns from White's point of view
+    score = 0
+    for square, piece in board.piece_map().items():
+        score += piece_square_value(piece.piece_type, piece.color, square)
+    defense = king_defense(board, chess.WHITE) ** 2 - king_defense(board, chess.BLACK) ** 2
+    return score + KING_DEFENSE_SCALAR * timed_king_defense(board) * defense
+
+
+class IncrementalEvaluator:
+    # Same score as evaluate(), kept up to date on make/unmake instead of rescanning the board.
+    # Only squares a move touches are re-scored; a king zone sum is rebuilt only when its king moves.
+    def __init__(self, board):
+        self.reset(board)
+
+    def reset(self, board):
+        self.psq = 0
+        for square, piece in board.piece_map().items():
+            self.psq += piece_square_value(piece.piece_type, piece.color, square)
+        self.kings = [board.king(chess.BLACK), board.king(chess.WHITE)]  # Indexed by color
+        self.defense = [king_defense(board, chess.BLACK), king_defense(board, chess.WHITE)]
+        self._stack = []
+
+    def _touched(self, board, move):
+        if board.is_castling(move):
+            return chess.SquareSet(chess.BB_RANKS[chess.square_rank(move.from_square)])  # King and rook
+        if board.is_en_passant(move):
+            captured = chess.square(chess.square_file(move.to_square), chess.square_rank(move.from_square))
+            return (move.from_square, move.to_square, captured)
+        return (move.from_square, move.to_square)
+
+    def push(self, board, move):
+        self._stack.append((self.psq, self.kings[:], self.defense[:]))
+        mover = board.turn
+        king_moved = board.piece_type_at(move.from_square) == chess.KING
+        touched = self._touched(board, move)
+        before = [board.piece_at(square) for square in touched]
+        board.push(move)
+        for square, old in zip(touched, before):
+            new = board.piece_at(square)
+            if old == new:
+                continue
+            for piece, sign in ((old, -1), (new, 1)):
+                if piece is None:
+                    continue
+                self.psq += sign * piece_square_value(piece.piece_type, piece.color, square)
+                king = self.kings[piece.color]
+                if king is not None and chess.BB_KING_ATTACKS[king] & chess.BB_SQUARES[square]:
+                    self.defense[piece.color] += sign * KING_DEFENSE_WEIGHTS[piece.piece_type]
+        if king_moved:
+            self.kings[mover] = board.king(mover)
+            self.defense[mover] = king_defense(board, mover)
+
+    def pop(self, board):
+        self.psq, self.kings, self.defense = self._stack.pop()
+        return board.pop()
+
+    def evaluate(self, board):
+        defense = self.defense[chess.WHITE] ** 2 - self.defense[chess.BLACK] ** 2
+        return self.psq + KING_DEFENSE_SCALAR * timed_king_defense(board) * defense
@@ -0,0 +1,213 @@
+import time
+from collections import namedtuple
+import chess
+import chess.polyglot
+from evaluation import IncrementalEvaluator, PIECE_VALUES
+from batch_eval import evaluate_children
+
+# In-process alternative to Stockfish: iterative deepening negamax with alpha-beta,
+# a Zobrist-keyed transposition table, MVV-LVA + killer move ordering and a capture
+# quiescence search, scored with the README evaluation in evaluation.py (kept up to date
+# incrementally on make/unmake). With batch_ordering, quiet moves near the root are
+# ordered by the static score of every child, computed in one vectorized batch_eval call.
+MATE_SCORE = 100000
+MAX_PLY = 64
+TT_EXACT, TT_LOWER, TT_UPPER = 0, 1, 2
+CHECK_EVERY = 1024  # Nodes between clock checks
+BATCH_ORDER_MIN_DEPTH = 3  # Batch-score quiet children only where the subtree is big enough to pay for it
+
+SearchResult = namedtuple('SearchResult', ['move', 'score', 'depth', 'nodes', 'time'])
+TTEntry = namedtuple('TTEntry', ['depth', 'score', 'flag', 'move'])
+
+
+class SearchAborted(Exception):
+    pass
+
+
+def _score_to_tt(score, ply):
+    # Mate scores count plies from the root; the table keeps them counted from this node, so a
+    # transposition reached at another ply reads back the right mate distance
+    if score >= MATE_SCORE - MAX_PLY:
+        return score + ply
+    if score <= -MATE_SCORE + MAX_PLY:
+        return score - ply
+    return score
+
+
+def _score_from_tt(score, ply):
+    if score >= MATE_SCORE - MAX_PLY:
+        return score - ply
+    if score <= -MATE_SCORE + MAX_PLY:
+        return score + ply
+    return score
+
+
+class TranspositionTable:
+    def __init__(self, max_entries=1 << 20):
+        self.max_entries = max_entries
+        self._entries = {}
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def store(self, key, depth, score, flag, move):
+        entry = self._entries.get(key)
+        if entry is not None and entry.depth > depth:
+            return  # Keep the deeper result
+        if entry is None and len(self._entries) >= self.max_entries:
+            self._entries.clear()  # Crude but cheap: start over rather than track ages
+        self._entries[key] = TTEntry(depth, score, flag, move)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class MinimaxEngine:
+    def __init__(self, tt=None, batch_ordering=False, stop=None):
+        self.tt = tt if tt is not None else TranspositionTable()
+        self.batch_ordering = batch_ordering
+        self.stop = stop  # Optional callable; True aborts the search like a spent clock
+
+    def search(self, board, depth=None, time_limit=None, nodes=None, start_depth=1):
+        # At least one limit should be given; depth defaults to MAX_PLY when only time/nodes bound it
+        board = board.copy()
+        self.evaluator = IncrementalEvaluator(board)
+        self.nodes = 0
+        self.node_limit = nodes
+        self.start = time.perf_counter()
+        self.deadline = self.start + time_limit if time_limit else None
+        self.killers = [[None, None] for _ in range(MAX_PLY + 1)]
+        max_depth = min(depth or MAX_PLY, MAX_PLY)
+
+        legal_moves = list(board.legal_moves)
+        if not legal_moves:
+            return SearchResult(None, 0, 0, 0, 0.0)
+        best = SearchResult(legal_moves[0], 0, 0, 0, 0.0)
+        for current_depth in range(min(start_depth, max_depth), max_depth + 1):
+            try:
+                score = self._negamax(board, current_depth, -MATE_SCORE - 1, MATE_SCORE + 1, 0)
+            except SearchAborted:
+                break  # Keep the last fully searched depth
+            entry = self.tt.get(chess.polyglot.zobrist_hash(board))
+            move = entry.move if entry is not None and entry.move is not None else best.move
+            best = SearchResult(move, score, current_depth, self.nodes, time.perf_counter() - self.start)
+            if abs(score) >= MATE_SCORE - MAX_PLY:
+                break  # Forced mate found; deeper search won't change it
+        return best._replace(nodes=self.nodes, time=time.perf_counter() - self.start)
+
+    def _check_limits(self):
+        if self.nodes % CHECK_EVERY == 0:
+            if self.deadline is not None and time.perf_counter() >= self.deadline:
+                raise SearchAborted()
+            if self.stop is not None and self.stop():
+                raise SearchAborted()
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            raise SearchAborted()
+
+    def _evaluate(self, board):
+        score = self.evaluator.evaluate(board)
+        return score if board.turn == chess.WHITE else -score
+
+    def _order_moves(self, board, moves, tt_move, ply, depth=0):
+        killers = self.killers[ply]
+        quiet_scores = {}
+        if self.batch_ordering and depth >= BATCH_ORDER_MIN_DEPTH:
+            quiet = [move for move in moves if not move.promotion and not board.is_capture(move)]
+            if quiet:
+                quiet_scores = dict(zip(quiet, evaluate_children(board, quiet).tolist()))
+
+        def score(move):
+            if move == tt_move:
+                return 1000000
+            if board.is_capture(move):
+                # MVV-LVA: most valuable victim first, cheapest attacker breaks ties
+                victim = chess.PAWN if board.is_en_passant(move) else board.piece_type_at(move.to_square)
+                return 100000 + PIECE_VALUES[victim] * 10 - PIECE_VALUES[board.piece_type_at(move.from_square)] // 100
+            if move.promotion:
+                return 90000 + PIECE_VALUES[move.promotion]
+            if move == killers[0]:
+                return 80000
+            if move == killers[1]:
+                return 70000
+            return quiet_scores.get(move, 0)  # Static score after the move, well below the killers
+
+        return sorted(moves, key=score, reverse=True)
+
+    def _negamax(self, board, depth, alpha, beta, ply):
+        self.nodes += 1
+        self._check_limits()
+
+        if ply > 0 and (board.halfmove_clock >= 100 or board.is_repetition(2)):
+            return 0
+        if depth <= 0:
+            return self._quiescence(board, alpha, beta, ply)
+
+        key = chess.polyglot.zobrist_hash(board)
+        entry = self.tt.get(key)
+        tt_move = None
+        if entry is not None:
+            tt_move = entry.move
+            if ply > 0 and entry.depth >= depth:
+                tt_score = _score_from_tt(entry.score, ply)
+                if entry.flag == TT_EXACT:
+                    return tt_score
+                if entry.flag == TT_LOWER and tt_score >= beta:
+                    return tt_score
+                if entry.flag == TT_UPPER and tt_score <= alpha:
+                    return tt_score
+
+        moves = list(board.legal_moves)
+        if not moves:
+            return -MATE_SCORE + ply if board.is_check() else 0
+
+        original_alpha = alpha
+        best_score = -MATE_SCORE - 1
+        best_move = None
+        for move in self._order_moves(board, moves, tt_move, ply, depth):
+            quiet = not board.is_capture(move) and not move.promotion
+            self.evaluator.push(board, move)
+            try:
+                score = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                self.evaluator.pop(board)
+            if score > best_score:
+                best_score, best_move = score, move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                if quiet and self.killers[ply][0] != move:
+                    self.killers[ply][1] = self.killers[ply][0]
+                    self.killers[ply][0] = move
+                break
+
+        if best_score <= original_alpha:
+            flag = TT_UPPER
+        elif best_score >= beta:
+            flag = TT_LOWER
+        else:
+            flag = TT_EXACT
+        self.tt.store(key, depth, _score_to_tt(best_score, ply), flag, best_move)
+        return best_score
+
+    def _quiescence(self, board, alpha, beta, ply):
+        # Only captures past the horizon, so a hanging piece isn't scored as safe
+        stand_pat = self._evaluate(board)
+        if stand_pat >= beta or ply >= MAX_PLY:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+        captures = list(board.generate_legal_captures())
+        for move in self._order_moves(board, captures, None, ply):
+            self.nodes += 1
+            self._check_limits()
+            self.evaluator.push(board, move)
+            try:
+                score = -self._quiescence(board, -beta, -alpha, ply + 1)
+            finally:
+                self.evaluator.pop(board)
+            if score >= beta:
+                return score
+            alpha = max(alpha, score)
+        return alpha
@@ -0,0 +1,94 @@
+import sqlite3
+import threading
+from collections import OrderedDict
+
+
+def normalize_fen(fen):
+    # Placement, side to move, castling, en passant — halfmove/fullmove clocks don't change the best move
+    return ' '.join(fen.split()[:4])
+
+
+class MoveCache:
+    def __init__(self, max_entries=4096, path=None, max_disk_entries=200000):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._entries = OrderedDict()  # key -> move uci, least recently used first
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._db = None
+        self._writes = 0
+        if path:
+            # Optional second tier that survives restarts; memory stays the hot LRU
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")  # Losing the last few entries on power cut is fine
+            self._db.execute("CREATE TABLE IF NOT EXISTS best_moves "
+                             "(key TEXT PRIMARY KEY, move TEXT NOT NULL, used INTEGER NOT NULL)")
+            self._db.commit()
+            self._clock = self._db.execute("SELECT COALESCE(MAX(used), 0) FROM best_moves").fetchone()[0]
+
+    @staticmethod
+    def key(fen, settings):
+        return f"{normalize_fen(fen)}|{settings}"
+
+    def get(self, fen, settings):
+        key = self.key(fen, settings)
+        with self._lock:
+            move = self._entries.get(key)
+            if move is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return move
+            if self._db is not None:
+                row = self._db.execute("SELECT move FROM best_moves WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._remember(key, row[0])
+                    self._touch(key, row[0])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return row[0]
+            self.misses += 1
+            return None
+
+    def put(self, fen, settings, move):
+        key = self.key(fen, settings)
+        with self._lock:
+            self._remember(key, move)
+            if self._db is not None:
+                self._touch(key, move)
+
+    def _remember(self, key, move):
+        self._entries[key] = move
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _touch(self, key, move):
+        self._clock += 1
+        self._db.execute("INSERT OR REPLACE INTO best_moves (key, move, used) VALUES (?, ?, ?)",
+                         (key, move, self._clock))
+        self._writes += 1
+        if self._writes % 256 == 0:
+            # Trim least recently used rows in batches rather than on every write
+            self._db.execute("DELETE FROM best_moves WHERE used <= ?", (self._clock - self.max_disk_entries,))
+        self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'disk_hits': self.disk_hits,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'persistent': self._db is not None,
+            }
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
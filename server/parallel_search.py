@@ -0,0 +1,151 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import chess
+import numpy as np
+from minimax import MinimaxEngine, TTEntry
+
+# Lazy SMP for the in-process engine: a pool of worker processes (one GIL each) all search the
+# same root and share one transposition table in shared memory, so what one worker proves cuts
+# the others' trees. Odd workers start an iteration deeper to spread the pool over depths.
+SCORE_SCALE = 20  # Evaluation scores are multiples of 0.05; stored as integers in the table
+SCORE_OFFSET = 1 << 31
+MOVE_PRESENT = 1 << 15
+POOL_WAIT_SHARE = 0.5  # Share of a timed search's budget it may spend waiting for the pool
+MIN_TIME_LEFT = 0.05  # Seconds a search gets at least, however long it waited
+
+
+def _pack(depth, score, flag, move):
+    packed_move = 0
+    if move is not None:
+        packed_move = MOVE_PRESENT | move.from_square | move.to_square << 6 | (move.promotion or 0) << 12
+    return (round(score * SCORE_SCALE) + SCORE_OFFSET) | depth << 32 | flag << 40 | packed_move << 42
+
+
+def _unpack(data):
+    packed_move = data >> 42
+    move = None
+    if packed_move & MOVE_PRESENT:
+        move = chess.Move(packed_move & 63, packed_move >> 6 & 63, (packed_move >> 12 & 7) or None)
+    score = ((data & 0xFFFFFFFF) - SCORE_OFFSET) / SCORE_SCALE
+    return TTEntry(data >> 32 & 0xFF, score, data >> 40 & 3, move)
+
+
+class SharedTranspositionTable:
+    # Same interface as minimax.TranspositionTable. Each slot is two 64-bit words, key ^ data and
+    # data, written without locks: a slot torn by two writers fails the key check and reads as a miss.
+    def __init__(self, entries=1 << 20, name=None):
+        if entries & (entries - 1):
+            raise ValueError("entries must be a power of two")
+        self.entries = entries
+        self._mask = entries - 1
+        self._owner = name is None
+        # Workers attach by name; spawned workers share the creator's resource tracker, so the
+        # block is only unlinked by close() in the creating process
+        self._shm = shared_memory.SharedMemory(name=name, create=self._owner, size=entries * 16)
+        self.name = self._shm.name
+        self._words = self._shm.buf.cast('Q')
+
+    def get(self, key):
+        index = (key & self._mask) * 2
+        data = self._words[index + 1]
+        if not data or self._words[index] ^ data != key:
+            return None
+        return _unpack(data)
+
+    def store(self, key, depth, score, flag, move):
+        index = (key & self._mask) * 2
+        data = self._words[index + 1]
+        if data and self._words[index] ^ data == key and data >> 32 & 0xFF > depth:
+            return  # Keep the deeper result; a different position is simply replaced
+        data = _pack(depth, score, flag, move)
+        self._words[index + 1] = data
+        self._words[index] = key ^ data
+
+    def clear(self):
+        self._shm.buf[:] = bytes(self.entries * 16)
+
+    def __len__(self):
+        return int(np.count_nonzero(np.frombuffer(self._shm.buf, dtype=np.uint64)[1::2]))
+
+    def close(self):
+        self._words.release()
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+_worker_tt = None
+_worker_stop = None
+
+
+def _init_worker(tt_name, tt_entries, stop):
+    global _worker_tt, _worker_stop
+    _worker_tt = SharedTranspositionTable(tt_entries, name=tt_name)
+    _worker_stop = stop
+
+
+def _ping():
+    return True
+
+
+def _search(board, depth, time_limit, nodes, start_depth, batch_ordering):
+    engine = MinimaxEngine(_worker_tt, batch_ordering=batch_ordering, stop=_worker_stop.is_set)
+    return engine.search(board, depth=depth, time_limit=time_limit, nodes=nodes, start_depth=start_depth)
+
+
+class ParallelSearch:
+    def __init__(self, workers=4, tt_entries=1 << 20, batch_ordering=False):
+        context = multiprocessing.get_context('spawn')  # Forking a process that runs threads is unsafe
+        self.workers = workers
+        self.batch_ordering = batch_ordering
+        self.tt = SharedTranspositionTable(tt_entries)
+        self._stop = context.Event()
+        self._executor = ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker,
+                                             initargs=(self.tt.name, tt_entries, self._stop))
+        self._lock = threading.Lock()  # One search at a time: every search uses every worker
+
+    def warm_up(self):
+        # Start the worker processes now rather than inside the first search
+        for future in [self._executor.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+
+    def search(self, board, depth=None, time_limit=None, nodes=None):
+        # Same limits and SearchResult as MinimaxEngine.search; nodes are split between workers.
+        # Waiting for the pool counts against time_limit; if another search still holds it after
+        # POOL_WAIT_SHARE of the budget, this one runs single-threaded here (sharing the table)
+        # in the time left, so a queue of requests never pushes a move past its limit.
+        start = time.perf_counter()
+        if not self._lock.acquire(timeout=time_limit * POOL_WAIT_SHARE if time_limit else -1):
+            result = MinimaxEngine(self.tt, batch_ordering=self.batch_ordering).search(
+                board, depth=depth, time_limit=self._time_left(time_limit, start), nodes=nodes)
+            return result._replace(time=time.perf_counter() - start)
+        try:
+            if time_limit:
+                time_limit = self._time_left(time_limit, start)
+            worker_nodes = max(nodes // self.workers, 1) if nodes else None
+            self._stop.clear()
+            futures = [self._executor.submit(_search, board, depth, time_limit, worker_nodes,
+                                             1 + worker % 2, self.batch_ordering)
+                       for worker in range(self.workers)]
+            main = futures[0].result()
+            self._stop.set()  # Helpers stop once the main worker is done
+            results = [main] + [future.result() for future in futures[1:]]
+        finally:
+            self._lock.release()
+        best = main
+        for result in results[1:]:
+            if result.move is not None and result.depth > best.depth:
+                best = result  # A helper finished an iteration the main worker did not
+        return best._replace(nodes=sum(result.nodes for result in results), time=time.perf_counter() - start)
+
+    @staticmethod
+    def _time_left(time_limit, start):
+        return max(time_limit - (time.perf_counter() - start), MIN_TIME_LEFT)
+
+    def close(self):
+        self._stop.set()
+        self._executor.shutdown(wait=True)
+        self.tt.close()
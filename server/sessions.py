@@ -0,0 +1,118 @@
+import threading
+import time
+from collections import OrderedDict
+import chess
+
+
+class PonderStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {'hits': self.hits, 'misses': self.misses,
+                    'hit_rate': round(self.hits / total, 3) if total else 0.0}
+
+
+class GameSession:
+    def __init__(self, game_id, slot, ponder_stats=None):
+        self.game_id = game_id
+        self.slot = slot  # Engine pool slot this game is pinned to
+        self.ponder_stats = ponder_stats
+        self.ponder_move = None  # Reply the engine is pondering on while the human thinks
+        self.ponder_hit = False
+        self.generation = 0
+        self.fresh = True  # No search yet in this game: the next one starts with ucinewgame
+        self.board = chess.Board()  # Keeps the move stack so the engine gets "position startpos moves ..."
+        self.last_used = time.monotonic()
+        self.lock = threading.Lock()
+
+    def engine_game(self, current):
+        # Token for chess.engine's game=, given the engine's current one: a different value makes it
+        # send ucinewgame, which clears the hash. Many games share the pool's few engines, so a new
+        # token is handed out only for a game's first search and after that the engine's is kept.
+        # Games on one engine share its hash (positions from another game are just misses) instead
+        # of clearing it on every move; the price is that a new game clears it for all of them.
+        if not self.fresh:
+            return current
+        self.fresh = False
+        return f"{self.game_id}:{self.generation}"
+
+    def new_game(self, fen=chess.STARTING_FEN):
+        self.generation += 1
+        self.fresh = True
+        self.board = chess.Board(fen)
+        self.ponder_move = None
+
+    def sync(self, fen, move_uci):
+        # Advance by the user's move if the client is where we left off, otherwise restart from its FEN
+        self.ponder_hit = self.ponder_move is not None and self.ponder_move == move_uci
+        if self.ponder_move is not None and self.ponder_stats is not None:
+            self.ponder_stats.record(self.ponder_hit)
+        self.ponder_move = None
+        if self.board.fen() == fen:
+            move = chess.Move.from_uci(move_uci)
+            if move in self.board.legal_moves:
+                self.board.push(move)
+                return True
+        board = chess.Board(fen)
+        board.push_uci(move_uci)
+        print(f"DEBUG: Session {self.game_id} out of sync — new game from client FEN")
+        self.new_game(board.fen())
+        return False
+
+    def push(self, move_uci):
+        self.board.push_uci(move_uci)
+
+
+class SessionManager:
+    def __init__(self, pool_size, max_sessions=64, idle_timeout=30 * 60):
+        self.pool_size = pool_size
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout  # Seconds before an idle game is dropped
+        self._sessions = OrderedDict()  # game_id -> GameSession, least recently used first
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.ponder_stats = PonderStats()
+
+    def _least_loaded_slot(self):
+        load = [0] * self.pool_size
+        for session in self._sessions.values():
+            load[session.slot] += 1
+        return load.index(min(load))
+
+    def _evict(self, now):
+        while self._sessions:
+            game_id, oldest = next(iter(self._sessions.items()))
+            if len(self._sessions) <= self.max_sessions and now - oldest.last_used < self.idle_timeout:
+                break
+            del self._sessions[game_id]
+            self.evictions += 1
+            print(f"DEBUG: Evicted idle session {game_id}")
+
+    def get(self, game_id):
+        # A game the client restarts keeps its session; complete_turn resets it under session.lock
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.pop(game_id, None)
+            if session is None:
+                session = GameSession(game_id, self._least_loaded_slot(), self.ponder_stats)
+            session.last_used = now
+            self._sessions[game_id] = session  # Most recently used at the end
+            self._evict(now)
+            return session
+
+    def stats(self):
+        with self._lock:
+            return {'sessions': len(self._sessions), 'evictions': self.evictions,
+                    'ponder': self.ponder_stats.stats()}
@@ -1,20 +1,31 @@
 #!/bin/bash
 
 # Chess Server Starter Script
-# Usage: ./start_server.sh [optional: --debug for verbose mode]
+# Usage: ./start_server.sh [optional: --debug for verbose mode | --async for the asyncio server]
 
 DEBUG=false
+ASYNC=false
 if [ "$1" = "--debug" ]; then
   DEBUG=true
+elif [ "$1" = "--async" ]; then
+  ASYNC=true
 fi
 
 # Update STOCKFISH_PATH if needed (edit this line)
-STOCKFISH_PATH="/Users/abdel_latrache/stockfish/stockfish"  # Change to your path
+export STOCKFISH_PATH="/Users/abdel_latrache/stockfish/stockfish"  # Change to your path (read by ai.py)
+export ENGINE_POOL_SIZE="${ENGINE_POOL_SIZE:-2}"  # Warm engines kept alive
+# export BOOK_PATH="book.bin"  # Polyglot opening book played instantly for the first BOOK_MAX_DEPTH plies
+# export MOVE_CACHE_PATH="move_cache.sqlite"  # Uncomment to keep cached best moves across restarts
+# export PONDER=0  # Uncomment to stop engines searching on the human's time
+# export AI_ENGINE=minimax  # Uncomment to use the in-process Python engine instead of Stockfish
+# export MINIMAX_WORKERS=4  # With AI_ENGINE=minimax: search on this many cores
 
 echo "Starting Chess Server..."
-echo "Stockfish path: $STOCKFISH_PATH"
+echo "Stockfish path: $STOCKFISH_PATH (pool size $ENGINE_POOL_SIZE)"
 
-if [ "$DEBUG" = true ]; then
+if [ "$ASYNC" = true ]; then
+  python3 async_app.py --port 8000
+elif [ "$DEBUG" = true ]; then
   python3 app.py --debug
 else
  python3 app.py
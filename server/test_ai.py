@@ -0,0 +1,54 @@
+import logging
+import os
+import sys
+import pytest
+
+SERVER_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(SERVER_DIR)
+
+import ai
+from engine_pool import EnginePool
+from sessions import SessionManager
+
+FAKE_ENGINE = [sys.executable, os.path.join(SERVER_DIR, 'benchmarks', 'fake_uci_engine.py'), '--startup-ms', '0']
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = EnginePool(FAKE_ENGINE, size=1)
+    monkeypatch.setattr(ai, '_pool', pool)
+    yield pool
+    pool.close()
+
+
+def new_games(caplog):
+    return sum(record.getMessage().endswith('<< ucinewgame') for record in caplog.records)
+
+
+def play(session, move_uci, limit):
+    session.sync(session.board.fen(), move_uci)
+    reply, _ = ai.uci_engine_move(session.board.fen(), session, limit)
+    session.push(reply)
+
+
+def test_games_sharing_an_engine_keep_its_hash(pool, caplog):
+    caplog.set_level(logging.DEBUG, logger='chess.engine')
+    sessions = SessionManager(pool_size=1)
+    first, second = sessions.get('first'), sessions.get('second')
+    limit = ai.search_limit(movetime=100)
+    for first_move, second_move in (('e2e4', 'd2d4'), ('g1f3', 'c2c4'), ('f1c4', 'b1c3')):
+        play(first, first_move, limit)
+        play(second, second_move, limit)
+    assert new_games(caplog) == 2  # One per game, not one per move
+
+
+def test_analysis_keeps_a_pinned_games_hash(pool, caplog):
+    caplog.set_level(logging.DEBUG, logger='chess.engine')
+    session = SessionManager(pool_size=1).get('game')
+    limit = ai.search_limit(movetime=100)
+    play(session, 'e2e4', limit)
+    ai.analyze_position('r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3', limit)
+    play(session, 'g1f3', limit)
+    session.new_game()
+    play(session, 'd2d4', limit)
+    assert new_games(caplog) == 2  # The game's start, and its restart
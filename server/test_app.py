@@ -0,0 +1,53 @@
+import os
+import sys
+import threading
+import time
+import chess
+import pytest
+
+SERVER_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(SERVER_DIR)
+
+import ai
+import app
+from engine_pool import EnginePool
+from move_cache import MoveCache
+from sessions import SessionManager
+
+FAKE_ENGINE = [sys.executable, os.path.join(SERVER_DIR, 'benchmarks', 'fake_uci_engine.py'), '--startup-ms', '0']
+BATCH_FENS = [
+    'r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3',
+    'rnbqkb1r/pppp1ppp/5n2/4p3/4P3/2N5/PPPP1PPP/R1BQKBNR w KQkq - 2 3',
+    'rnbqkbnr/pp1ppppp/8/2p5/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2',
+    'rnbqkbnr/ppp1pppp/8/3p4/2PP4/8/PP2PPPP/RNBQKBNR b KQkq - 0 2',
+]
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = EnginePool(FAKE_ENGINE, size=2)
+    monkeypatch.setattr(ai, '_pool', pool)
+    monkeypatch.setattr(ai, '_sessions', SessionManager(pool_size=2))
+    monkeypatch.setattr(ai, '_cache', MoveCache())
+    yield pool
+    pool.close()
+
+
+def test_live_move_gets_an_engine_during_a_batch(pool):
+    assert app.analysis_executor._max_workers == 1
+    client = app.app.test_client()
+    batch = threading.Thread(target=lambda: client.post('/analyze_batch', json={
+        'fens': BATCH_FENS, 'movetime': 800}).get_data())
+    batch.start()
+    time.sleep(0.3)
+    busy = ({0, 1} - set(pool._idle)).pop()
+    ai.get_sessions().get('game').slot = busy  # Pinned to the engine the batch is using
+
+    for game_id, move in ((None, 'e2e4'), ('game', 'd2d4')):
+        start = time.perf_counter()
+        reply = client.post('/validate_and_predict', json={
+            'move': move, 'fen': chess.STARTING_FEN, 'game_id': game_id, 'movetime': 500}).get_json()
+        assert reply['search']['source'] == 'engine'
+        assert time.perf_counter() - start < 1.0  # Searched at once, not after the batch's move
+    assert batch.is_alive()
+    batch.join()
@@ -0,0 +1,78 @@
+import os
+import random
+import sys
+import chess
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from batch_eval import evaluate_boards, evaluate_children
+from evaluation import IncrementalEvaluator, evaluate
+
+
+def random_playout(rng, max_plies=200):
+    board = chess.Board()
+    moves = []
+    while not board.is_game_over() and len(moves) < max_plies:
+        move = rng.choice(list(board.legal_moves))
+        board.push(move)
+        moves.append(move)
+    return moves
+
+
+def random_positions(count, rng):
+    positions = []
+    while len(positions) < count:
+        board = chess.Board()
+        for move in random_playout(rng, max_plies=rng.randint(0, 120)):
+            board.push(move)
+        if not board.is_game_over():
+            positions.append(board)
+    return positions
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_incremental_matches_from_scratch_on_make_and_unmake(seed):
+    board = chess.Board()
+    evaluator = IncrementalEvaluator(board)
+    moves = random_playout(random.Random(seed))
+    for move in moves:
+        evaluator.push(board, move)
+        assert evaluator.evaluate(board) == evaluate(board), f"after {move} in {board.fen()}"
+    for _ in moves:  # Unmake must restore every earlier score too
+        evaluator.pop(board)
+        assert evaluator.evaluate(board) == evaluate(board), f"on unmake at {board.fen()}"
+
+
+@pytest.mark.parametrize('fen, uci', [
+    ('r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1', 'e1g1'),  # Castling moves the rook too
+    ('r3k2r/8/8/8/8/8/8/R3K2R b KQkq - 0 1', 'e8c8'),
+    ('4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 2', 'e5d6'),  # En passant takes a pawn off another square
+    ('4k3/1P6/8/8/8/8/8/4K3 w - - 0 40', 'b7b8n'),  # Promotion, with the timed term at its cap
+])
+def test_incremental_special_moves(fen, uci):
+    board = chess.Board(fen)
+    evaluator = IncrementalEvaluator(board)
+    evaluator.push(board, chess.Move.from_uci(uci))
+    assert evaluator.evaluate(board) == evaluate(board)
+    evaluator.pop(board)
+    assert evaluator.evaluate(board) == evaluate(board)
+
+
+def test_batch_matches_evaluate():
+    positions = random_positions(300, random.Random(1)) + [chess.Board()]
+    expected = [evaluate(board) for board in positions]
+    assert np.allclose(evaluate_boards(positions), expected)
+
+
+def test_batch_children_match_evaluate_from_the_movers_side():
+    for board in random_positions(40, random.Random(2)):
+        moves = list(board.legal_moves)
+        sign = 1 if board.turn == chess.WHITE else -1
+        expected = []
+        for move in moves:
+            board.push(move)
+            expected.append(sign * evaluate(board))
+            board.pop()
+        assert np.allclose(evaluate_children(board, moves), expected), board.fen()
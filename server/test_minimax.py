@@ -0,0 +1,40 @@
+import os
+import sys
+import chess
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from minimax import MinimaxEngine, TranspositionTable, MATE_SCORE
+
+MATE_IN_2 = 'r1b2k1r/ppp1bppp/8/1B1Q4/5q2/2P5/PPP2PPP/R3R1K1 w - - 1 1'  # Qd8+ Bxd8 Re8#
+
+
+def plies_to_mate(result):
+    return MATE_SCORE - result.score
+
+
+def test_finds_mate_in_two():
+    result = MinimaxEngine().search(chess.Board(MATE_IN_2), depth=5)
+    assert result.move == chess.Move.from_uci('d5d8')
+    assert plies_to_mate(result) == 3
+
+
+def test_mate_found_from_a_transposition_keeps_its_distance():
+    # The mate-in-one after Qd8+ Bxd8 is stored at the root of one search, then reached at ply 2
+    # of the next: it must still count as mate in two from there
+    tt = TranspositionTable()
+    board = chess.Board(MATE_IN_2)
+    board.push_uci('d5d8')
+    board.push_uci('e7d8')
+    assert plies_to_mate(MinimaxEngine(tt).search(board, depth=3)) == 1
+    result = MinimaxEngine(tt).search(chess.Board(MATE_IN_2), depth=5)
+    assert plies_to_mate(result) == 3
+
+
+def test_mated_side_sees_the_same_distance_with_a_warm_table():
+    tt = TranspositionTable()
+    board = chess.Board(MATE_IN_2)
+    board.push_uci('d5d8')
+    cold = MinimaxEngine().search(board, depth=4)
+    MinimaxEngine(tt).search(chess.Board(MATE_IN_2), depth=5)
+    assert MinimaxEngine(tt).search(board, depth=4).score == cold.score == -MATE_SCORE + 2
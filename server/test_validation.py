@@ -0,0 +1,62 @@
+import os
+import sys
+import chess
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from validation import get_illegal_reason, validate_move
+
+
+def reason(fen, uci):
+    return get_illegal_reason(chess.Board(fen), chess.Move.from_uci(uci))
+
+
+def test_two_file_king_move_off_home_square_is_not_castling():
+    assert reason('8/8/8/8/3K4/8/8/7k w - - 0 1', 'd4f4') == "A king can't move from d4 to f4."
+
+
+def test_castling_without_rights():
+    assert reason('r3k2r/8/8/8/8/8/8/R3K2R w - - 0 1', 'e1g1') == \
+        "Castling kingside isn't allowed — the king or that rook has already moved."
+
+
+def test_castling_blocked():
+    assert reason(chess.STARTING_FEN, 'e1g1').startswith("Path blocked at f1")
+
+
+def test_castling_through_check():
+    assert reason('r3k2r/8/8/8/8/8/5r2/R3K2R w KQkq - 0 1', 'e1g1') == \
+        "You can't castle through check — f1 is attacked."
+
+
+def test_black_castling_from_e8():
+    assert reason('r3k2r/8/8/8/8/8/8/4K3 b - - 0 1', 'e8c8') == \
+        "Castling queenside isn't allowed — the king or that rook has already moved."
+
+
+@pytest.mark.parametrize('uci', ['a7a8k', 'a7a8p'])
+def test_bad_promotion_piece(uci):
+    assert reason('8/P7/8/8/3K4/8/8/7k w - - 0 1', uci) == \
+        "A pawn can only promote to a knight, bishop, rook or queen."
+
+
+@pytest.mark.parametrize('fen, uci', [
+    ('8/P7/8/8/3K4/8/8/7k w - - 0 1', 'd4d5q'),  # Not a pawn
+    ('8/8/P7/8/3K4/8/8/7k w - - 0 1', 'a6a7q'),  # Not the last rank
+    ('8/8/8/8/3P4/8/8/K6k w - - 0 1', 'd4f1k'),  # White pawn to its own back rank
+    ('k6K/8/8/3p4/8/8/8/8 b - - 0 1', 'd5d8n'),  # Black pawn to White's back rank
+])
+def test_promotion_suffix_on_wrong_move(fen, uci):
+    assert reason(fen, uci) == "Only a pawn reaching the last rank can promote."
+
+
+def test_missing_promotion_piece():
+    assert reason('8/P7/8/8/3K4/8/8/7k w - - 0 1', 'a7a8') == "Choose a promotion piece — e.g. a7a8q."
+
+
+def test_validate_move_same_answer_cold_and_cached():
+    fen = 'r3k2r/8/8/8/8/8/5r2/R3K2R w KQkq - 0 1'
+    cold = validate_move('e1g1', fen)
+    assert cold == validate_move('e1g1', fen)
+    assert cold[0] is False and cold[2] == "Invalid: You can't castle through check — f1 is attacked."
@@ -1,24 +1,209 @@
+import threading
+from collections import OrderedDict
 import chess
+
+BOARD_CACHE_SIZE = 256  # Recently seen positions kept parsed, with their legal moves
+PROMOTION_PIECES = (chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN)
+
+# FEN -> [board, legal moves or None]; boards in here are never mutated, callers get copies
+_boards = OrderedDict()
+_boards_lock = threading.Lock()
+
+
+def _cached(fen):
+    with _boards_lock:
+        entry = _boards.get(fen)
+        if entry is not None:
+            _boards.move_to_end(fen)
+        return entry
+
+
+def _entry(fen):
+    entry = _cached(fen)
+    if entry is not None:
+        return entry
+    entry = [chess.Board(fen), None]  # Parse outside the lock; raises ValueError for a bad FEN
+    _remember(fen, entry)
+    return entry
+
+
+def _remember(fen, entry):
+    with _boards_lock:
+        _boards[fen] = entry
+        _boards.move_to_end(fen)
+        while len(_boards) > BOARD_CACHE_SIZE:
+            _boards.popitem(last=False)
+
+
+def _legal_moves(entry):
+    # Generated once per position, then shared by later checks and illegal-move reasons
+    if entry[1] is None:
+        entry[1] = frozenset(entry[0].legal_moves)
+    return entry[1]
+
+
+def parse_board(fen):
+    # A fresh Board for this FEN without re-parsing it when it was seen recently
+    return _entry(fen)[0].copy(stack=False)
+
+
 # TODO later everything will be returned back to AI, Only AI can generate reason (text, description to talk)
 def validate_move(uci, fen):
-    board = chess.Board(fen)
     try:
         move = chess.Move.from_uci(uci)
-        if move in board.legal_moves:
-            board.push(move)
-            return True, board.fen(), "Move accepted — strategic choice!"
-        else:
-            reason = get_illegal_reason(board, move)
-            return False, board.fen(), f"Invalid: {reason}"
     except ValueError:
         return False, fen, "Invalid UCI format — use 'e2e4' style."
+    entry = _cached(fen)
+    # A position seen for the first time is parsed for this call only, with no cache
+    # bookkeeping, so a cold call costs what an uncached one did
+    board = entry[0] if entry is not None else chess.Board(fen)
+    # A legal move needs one is_legal() check; the full list is only generated (once per
+    # cached position) when it is needed for the reason
+    legal = move in entry[1] if entry is not None and entry[1] is not None else board.is_legal(move)
+    if legal:
+        if entry is not None:
+            board = board.copy(stack=False)
+        board.push(move)
+        new_fen = board.fen()
+        _remember(new_fen, [board, None])  # The AI reply is searched from here next
+        return True, new_fen, "Move accepted — strategic choice!"
+    if entry is None:
+        _remember(fen, [board, None])  # A rejected move is often retried on the same position
+        reason = get_illegal_reason(board, move)
+    else:
+        reason = get_illegal_reason(board, move, _legal_moves(entry))
+    return False, board.fen(), f"Invalid: {reason}"
+
+
+def get_illegal_reason(board, move, legal_moves=None):
+    # Why a move is illegal, checked from cheapest to dearest: board lookups, then precomputed
+    # attack/ray tables for the piece's geometry and path, then (only for moves that are otherwise
+    # fine) the king-safety test. legal_moves is the position's already generated move set, if
+    # any; without it single moves are checked with is_legal().
+    is_legal = legal_moves.__contains__ if legal_moves is not None else board.is_legal
+    if is_legal(move):
+        return "Unknown error."
+    source, target = move.from_square, move.to_square
+    piece = board.piece_at(source)
+    if source == target:
+        return "A move has to go to a different square."
+    if piece is None:
+        return f"No piece on {chess.square_name(source)}."
+    if piece.color != board.turn:
+        return f"It's {chess.COLOR_NAMES[board.turn].capitalize()}'s turn — the {_piece_name(piece)} on {chess.square_name(source)} isn't yours."
+    if piece.piece_type == chess.KING and _is_castling_attempt(piece, move):
+        return _castling_reason(board, move)
+    captured = board.piece_at(target)
+    if captured is not None and captured.color == piece.color:
+        return f"Your own {_piece_name(captured)} is on {chess.square_name(target)}."
+    if move.promotion is not None:
+        last_rank = chess.BB_RANK_8 if piece.color == chess.WHITE else chess.BB_RANK_1
+        if piece.piece_type != chess.PAWN or not chess.BB_SQUARES[target] & last_rank:
+            return "Only a pawn reaching the last rank can promote."
+        if move.promotion not in PROMOTION_PIECES:
+            return "A pawn can only promote to a knight, bishop, rook or queen."
+    reason = _pawn_reason(board, move, piece) if piece.piece_type == chess.PAWN else _piece_reason(board, move, piece)
+    if reason:
+        return reason
+    if move.promotion is None and is_legal(chess.Move(source, target, chess.QUEEN)):
+        return f"Choose a promotion piece — e.g. {chess.Move(source, target, chess.QUEEN).uci()}."
+    return _king_safety_reason(board, move, piece)
+
+
+def _is_castling_attempt(piece, move):
+    # King from its home square to the g or c file of its own back rank. Any other two-file king
+    # move is just an illegal king move (board.is_castling says yes to all of them).
+    home = chess.E1 if piece.color == chess.WHITE else chess.E8
+    return move.from_square == home and move.to_square in (home + 2, home - 2)
+
+
+def _piece_name(piece):
+    return chess.piece_name(piece.piece_type)
+
+
+def _first_blocker(board, source, target):
+    # Occupied square nearest the source on the line between the two squares, or None
+    blockers = chess.between(source, target) & board.occupied
+    if not blockers:
+        return None
+    return min(chess.scan_forward(blockers), key=lambda square: chess.square_distance(source, square))
+
+
+def _piece_reason(board, move, piece):
+    source, target = move.from_square, move.to_square
+    on_line = chess.BB_RAYS[source][target] != 0  # Same rank, file or diagonal
+    straight = chess.square_rank(source) == chess.square_rank(target) or \
+        chess.square_file(source) == chess.square_file(target)
+    reachable = {
+        chess.KNIGHT: chess.BB_KNIGHT_ATTACKS[source] & chess.BB_SQUARES[target],
+        chess.BISHOP: on_line and not straight,
+        chess.ROOK: on_line and straight,
+        chess.QUEEN: on_line,
+        chess.KING: chess.BB_KING_ATTACKS[source] & chess.BB_SQUARES[target],
+    }[piece.piece_type]
+    if not reachable:
+        return f"A {_piece_name(piece)} can't move from {chess.square_name(source)} to {chess.square_name(target)}."
+    blocker = _first_blocker(board, source, target)
+    if blocker is not None:
+        return f"Path blocked at {chess.square_name(blocker)}."
+    return None
+
+
+def _pawn_reason(board, move, piece):
+    source, target = move.from_square, move.to_square
+    direction = 1 if piece.color == chess.WHITE else -1
+    ranks = (chess.square_rank(target) - chess.square_rank(source)) * direction
+    if ranks < 0:
+        return "Pawns can't retreat — advance only."
+    if chess.square_file(target) == chess.square_file(source):
+        start_rank = 1 if piece.color == chess.WHITE else 6
+        if ranks > 2 or ranks == 2 and chess.square_rank(source) != start_rank:
+            return "Pawns move one square forward (two from their starting rank)."
+        for square in (source + 8 * direction, target)[2 - ranks:]:
+            if board.piece_at(square) is not None:
+                return f"Path blocked at {chess.square_name(square)} — pawns can't capture straight ahead."
+        return None
+    if not chess.BB_PAWN_ATTACKS[piece.color][source] & chess.BB_SQUARES[target]:
+        return f"A pawn can't move from {chess.square_name(source)} to {chess.square_name(target)}."
+    if board.piece_at(target) is None and target != board.ep_square:
+        return "Pawns move diagonally only to capture."
+    return None
+
+
+def _castling_reason(board, move):
+    king = move.from_square
+    kingside = chess.square_file(move.to_square) > chess.square_file(king)
+    rights = board.has_kingside_castling_rights if kingside else board.has_queenside_castling_rights
+    if not rights(board.turn):
+        side = "kingside" if kingside else "queenside"
+        return f"Castling {side} isn't allowed — the king or that rook has already moved."
+    rook = chess.square(7 if kingside else 0, chess.square_rank(king))
+    blocker = _first_blocker(board, king, rook)
+    if blocker is not None:
+        return f"Path blocked at {chess.square_name(blocker)} — castling needs the squares between king and rook empty."
+    if board.is_check():
+        return "You can't castle out of check."
+    destination = chess.square(6 if kingside else 2, chess.square_rank(king))
+    for square in chess.scan_forward(chess.between(king, destination)):
+        if board.is_attacked_by(not board.turn, square):
+            return f"You can't castle through check — {chess.square_name(square)} is attacked."
+    if board.is_attacked_by(not board.turn, destination):
+        return f"You can't castle into check — {chess.square_name(destination)} is attacked."
+    return "Castling isn't possible here."
+
 
-def get_illegal_reason(board, move):
-    if move not in board.legal_moves:
-        # Simple rule check
-        piece = board.piece_at(move.from_square)
-        if piece and piece.piece_type == chess.PAWN:
-            if move.to_square < move.from_square and piece.color == chess.WHITE:
-                return "Pawns can't retreat — advance only."
-        return "Blocked path or illegal for piece type."
-    return "Unknown error."
\ No newline at end of file
+def _king_safety_reason(board, move, piece):
+    # The move fits the piece and its path: it must leave (or put) the king in check
+    after = board.copy(stack=False)
+    after.push(move)
+    king = after.king(board.turn)
+    attackers = after.attackers(not board.turn, king) if king is not None else chess.SquareSet()
+    attacker = next(iter(attackers), None)
+    if attacker is None:
+        return "That move would leave your king in check."
+    by = f"the {chess.piece_name(after.piece_type_at(attacker))} on {chess.square_name(attacker)}"
+    if piece.piece_type == chess.KING:
+        return f"Your king would be in check on {chess.square_name(move.to_square)} from {by}."
+    if board.is_check():
+        return f"You're in check — that move doesn't stop the check from {by}."
+    return f"The {_piece_name(piece)} on {chess.square_name(move.from_square)} is pinned — moving it exposes your king to {by}."
@@ -0,0 +1,57 @@
+import os
+import sys
+import chess
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from gameProcessing import play
+from minimax import MinimaxEngine
+
+
+class FakeChannel:
+    # Stands in for the move_channel connection: GUI moves to hand out, then EOF as on close
+    def __init__(self, moves):
+        self.moves = list(moves)
+        self.sent = []
+
+    def recv(self):
+        if not self.moves:
+            raise EOFError
+        return self.moves.pop(0)
+
+    def send(self, message):
+        self.sent.append(message)
+
+
+class FakeArm:
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.calls.append((name,) + args)
+
+
+def test_gui_move_gets_a_reply_and_arm_plays_it():
+    board = chess.Board()
+    gui, arm = FakeChannel(['e2e4']), FakeArm()
+    play(board, MinimaxEngine(), gui, arm, think_time=0.2)
+    reply = gui.sent[0]
+    assert gui.sent == [reply]  # GUI closed afterwards: no game-over message
+    assert board.move_stack == [chess.Move.from_uci('e2e4'), chess.Move.from_uci(reply)]
+    assert ('move_to_square', reply[:2]) in arm.calls and ('move_to_square', reply[2:4]) in arm.calls
+
+
+def test_illegal_gui_move_is_skipped():
+    board = chess.Board()
+    gui = FakeChannel(['e2e5'])
+    play(board, MinimaxEngine(), gui, think_time=0.2)
+    assert gui.sent == [] and board.move_stack == []
+
+
+def test_human_mate_ends_the_game_without_an_ai_move():
+    board = chess.Board('r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4')
+    gui, arm = FakeChannel(['h5f7', 'a2a3']), FakeArm()
+    play(board, MinimaxEngine(), gui, arm, think_time=0.2)
+    assert board.is_checkmate()
+    assert gui.sent == [None]
+    assert gui.moves == ['a2a3'] and arm.calls == []